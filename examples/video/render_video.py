@@ -0,0 +1,163 @@
+"""
+Parallel, cached render driver for the explainer video.
+
+Each scene class in three_dimensional_computing_video.py is rendered as its own
+job on a process pool. Finished segments are cached under media/segments/ by a
+hash of the scene's source, the rest of the module (imports, constants and
+helpers) and the render parameters, so
+a rebuild only re-renders the scenes that actually changed. The final video is
+stitched from the cached segments with ffmpeg.
+
+Usage:
+    python render_video.py [--quality l|m|h|k] [--jobs N] [--output FILE]
+"""
+
+import argparse
+import ast
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VIDEO_MODULE = os.path.join(HERE, "three_dimensional_computing_video.py")
+CACHE_DIR = os.path.join(HERE, "media", "segments")
+
+# The scene that plays every other scene's construct() in order
+VIDEO_SCENE = "ThreeDimensionalComputingVideo"
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "k": "fourk_quality",
+}
+
+
+def scene_order(tree):
+    """Return the scene names in the order VIDEO_SCENE's construct() calls them."""
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == VIDEO_SCENE:
+            break
+    else:
+        raise ValueError(f"{VIDEO_SCENE} not found")
+    construct = next((item for item in node.body
+                      if isinstance(item, ast.FunctionDef) and item.name == "construct"), None)
+    if construct is None:
+        raise ValueError(f"{VIDEO_SCENE} has no construct method")
+    order = []
+    for call in ast.walk(construct):
+        # Matches SceneName.construct(self)
+        if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                and call.func.attr == "construct" and isinstance(call.func.value, ast.Name)):
+            order.append((call.lineno, call.col_offset, call.func.value.id))
+    return [name for _, _, name in sorted(order)]
+
+
+def scene_sources(path=VIDEO_MODULE):
+    """Return the scene order, the module preamble and each scene's source, without importing manim.
+
+    The preamble is every top-level statement other than the scene classes
+    (imports, constants, helper functions and classes), so editing anything a
+    scene might use invalidates its cached segment.
+    """
+    with open(path) as f:
+        source = f.read()
+    tree = ast.parse(source)
+    scenes = scene_order(tree)
+    classes = {node.name: ast.get_source_segment(source, node) for node in tree.body
+               if isinstance(node, ast.ClassDef) and node.name in scenes}
+    missing = [name for name in scenes if name not in classes]
+    if missing:
+        raise ValueError(f"Scenes not found in {path}: {', '.join(missing)}")
+    preamble = [ast.get_source_segment(source, node) for node in tree.body
+                if not (isinstance(node, ast.ClassDef) and (node.name in scenes or node.name == VIDEO_SCENE))]
+    return scenes, "\n".join(preamble), classes
+
+
+def manim_version():
+    """Return the installed manim version, which also affects the rendered output."""
+    try:
+        from importlib.metadata import version
+        return version("manim")
+    except Exception:
+        return "unknown"
+
+
+def segment_key(name, scene_source, preamble, params):
+    """Hash everything that determines a scene's rendered segment."""
+    digest = hashlib.sha256()
+    for part in (name, preamble, scene_source, manim_version(), repr(sorted(params.items()))):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def segment_path(name, key):
+    """Return the cache location of a scene segment."""
+    return os.path.join(CACHE_DIR, f"{name}-{key}.mp4")
+
+
+def render_scene(name, quality, output_path):
+    """Render one scene in this (worker) process and move it into the cache."""
+    sys.path.insert(0, HERE)
+    import manim
+    import three_dimensional_computing_video as video
+
+    with tempfile.TemporaryDirectory(dir=CACHE_DIR) as tmp:
+        with manim.tempconfig({"quality": QUALITIES[quality], "media_dir": tmp,
+                               "disable_caching": True, "progress_bar": "none"}):
+            scene = getattr(video, name)()
+            scene.render()
+            rendered = scene.renderer.file_writer.movie_file_path
+        # Write under a temporary name first so a crashed job never leaves a partial segment
+        partial = output_path + ".partial"
+        shutil.move(rendered, partial)
+        os.replace(partial, output_path)
+    return name
+
+
+def stitch(paths, output):
+    """Concatenate rendered segments into the final video without re-encoding."""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for path in paths:
+            listing.write(f"file '{path}'\n")
+    try:
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                        "-i", listing.name, "-c", "copy", output], check=True)
+    finally:
+        os.unlink(listing.name)
+
+
+def build(quality="m", jobs=None, output=None):
+    """Render any stale scenes in parallel and stitch the full video."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    scenes, preamble, classes = scene_sources()
+    params = {"quality": quality}
+    segments = {name: segment_path(name, segment_key(name, classes[name], preamble, params))
+                for name in scenes}
+
+    stale = [name for name in scenes if not os.path.exists(segments[name])]
+    print(f"{len(scenes) - len(stale)} cached, {len(stale)} to render")
+    if stale:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(render_scene, name, quality, segments[name]): name for name in stale}
+            for future in as_completed(futures):
+                print(f"Rendered {future.result()}")
+
+    output = output or os.path.join(HERE, "media", f"ThreeDimensionalComputingVideo_{quality}.mp4")
+    stitch([segments[name] for name in scenes], output)
+    print(f"Wrote {output}")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--quality", choices=sorted(QUALITIES), default="m")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    build(args.quality, args.jobs, args.output)
@@ -0,0 +1,88 @@
+"""
+Packed Trit Arrays
+
+This module holds many TriWords as a single NumPy int8 array of shape
+(count, width), most significant trit first, so that bulk operations do not
+pay for one Python Trit object per digit.
+"""
+
+import itertools
+import operator
+
+import numpy as np
+
+from trinary_simulator import TriWord
+
+# Widest word whose balanced-ternary value fits in a signed 64-bit integer
+MAX_DECIMAL_TRITS = 40
+
+# Reads the stored value directly; the Trit.value property costs a Python call per trit
+_TRIT_VALUE = operator.attrgetter("_value")
+
+
+def as_trit_array(values, dtype=np.int8):
+    """Convert values to a trit array, checking that every entry is -1, 0 or 1.
+
+    The check runs in the input's own dtype, before narrowing, so wider
+    integers such as 255 or 256 are rejected rather than wrapped into range.
+    """
+    array = np.asarray(values)
+    if array.size and (array.min() < -1 or array.max() > 1):
+        raise ValueError("Trit value must be -1, 0, or 1")
+    trits = array.astype(dtype, copy=False)
+    if array.dtype.kind not in "biu" and array.size and np.any(trits != array):
+        raise ValueError("Trit value must be -1, 0, or 1")  # e.g. 0.5
+    return trits
+
+
+def triword_values(words):
+    """Return the trits of a sequence of TriWords concatenated into one int8 array."""
+    words = list(words)
+    count = sum(map(len, words))
+    return np.fromiter(map(_TRIT_VALUE, itertools.chain.from_iterable(words)), dtype=np.int8, count=count)
+
+
+def pack_triwords(words):
+    """Pack a sequence of equal-length TriWords into a (count, width) array."""
+    words = list(words)
+    if not words:
+        return np.zeros((0, 0), dtype=np.int8)
+    width = len(words[0])
+    if any(len(word) != width for word in words):
+        raise ValueError("All TriWords must have the same length")
+    return triword_values(words).reshape(len(words), width)
+
+
+def unpack_triwords(array):
+    """Convert a (count, width) trit array back into a list of TriWords."""
+    array = np.atleast_2d(array)
+    return [TriWord(row.tolist(), length=array.shape[1]) for row in array]
+
+
+def place_values(width):
+    """Return the int64 place values 3**(width-1) ... 3**0."""
+    if width > MAX_DECIMAL_TRITS:
+        raise ValueError(f"Words wider than {MAX_DECIMAL_TRITS} trits do not fit in int64")
+    return 3 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+
+
+def to_decimal(array):
+    """Return the balanced-ternary value of each row, like TriWord.to_decimal."""
+    array = np.atleast_2d(array)
+    return array.astype(np.int64) @ place_values(array.shape[1])
+
+
+def from_decimal(values, width):
+    """Convert integers to a (count, width) balanced-ternary trit array."""
+    values = np.array(values, dtype=np.int64).reshape(-1)
+    limit = (3 ** width - 1) // 2 if width <= MAX_DECIMAL_TRITS else None
+    if limit is not None and values.size and np.abs(values).max() > limit:
+        raise ValueError(f"Value does not fit in {width} trits")
+    trits = np.zeros((values.size, width), dtype=np.int8)
+    remaining = values.copy()
+    for column in range(width - 1, -1, -1):
+        digit = remaining % 3  # 0, 1 or 2 for any sign
+        digit[digit == 2] = -1
+        trits[:, column] = digit
+        remaining = (remaining - digit) // 3
+    return trits
@@ -0,0 +1,225 @@
+"""
+Trinary Result Cache
+
+This module provides a persistent, content-addressed cache for
+TrinaryCPU.execute results. Entries are keyed by a hash of the program, the
+initial register state, the register geometry, the program counter and the
+computation mode, and store the final register file in the dense packed format
+of trinary_codec. The cache is bounded in size with least-recently-used
+eviction, and is safe to share between processes: entries are written
+atomically and eviction is serialized with a lock file.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from array import array
+
+try:
+    import fcntl
+except ImportError:  # Windows: atomic renames still keep entries consistent
+    fcntl = None
+
+import numpy as np
+
+from trinary_codec import dump_trits, read_trits
+from trinary_arrays import triword_values, unpack_triwords
+
+MODES = ("FULL_TRINARY", "ABSOLUTE_VALUE")
+# Entry header: final program counter, final mode index, register count;
+# followed by one uint32 width per register and a single block of all trits
+_ENTRY = struct.Struct("<QBI")
+
+
+def _program_parts(program):
+    """Split a program into its JSON-able structure and the raw bytes of its LOAD values.
+
+    Trit lists are hashed as int8 bytes instead of through json, which
+    dominates the cost of keying programs that load wide registers.
+    """
+    structure = []
+    values = []
+    for instruction in program:
+        value = instruction.get("value")
+        if isinstance(value, (list, tuple)):
+            try:
+                values.append(array("b", value).tobytes())
+                instruction = dict(instruction, value=len(value))
+            except (TypeError, OverflowError):
+                pass  # Not small integers; hashed through json as-is
+        structure.append(instruction)
+    return structure, values
+
+
+def program_key(program, registers, program_counter=0, mode="FULL_TRINARY"):
+    """Return the content hash identifying one execution."""
+    structure, values = _program_parts(program)
+    digest = hashlib.sha256()
+    header = {
+        "program": structure,
+        "geometry": [len(registers), [len(register) for register in registers]],
+        "program_counter": program_counter,
+        "mode": mode,
+    }
+    digest.update(json.dumps(header, sort_keys=True, separators=(",", ":")).encode())
+    for value in values:
+        digest.update(value)
+    digest.update(triword_values(registers).tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """A size-bounded on-disk cache of final register files."""
+
+    def __init__(self, directory, max_bytes=1 << 30, evict_interval=64):
+        """Initialize the cache in directory, evicting beyond max_bytes."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        """Return the file holding key, fanned out over 256 subdirectories."""
+        return os.path.join(self.directory, key[:2], key[2:] + ".trit")
+
+    def get_packed(self, key):
+        """Return (register trit arrays, program_counter, mode) for key, or None on a miss.
+
+        This is the fast path: it skips building a Trit object per trit,
+        which dominates the cost of get() for wide registers.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                program_counter, mode, count = _ENTRY.unpack(file.read(_ENTRY.size))
+                widths = np.frombuffer(file.read(4 * count), dtype="<u4", count=count)
+                trits = read_trits(file)
+            if trits.size != widths.sum():
+                raise ValueError("Corrupt cache entry")
+            registers = np.split(trits, np.cumsum(widths[:-1], dtype=np.int64))
+        except (FileNotFoundError, struct.error, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return registers, program_counter, MODES[mode]
+
+    def get(self, key):
+        """Return (registers, program_counter, mode) for key, or None on a miss."""
+        cached = self.get_packed(key)
+        if cached is None:
+            return None
+        registers, program_counter, mode = cached
+        return [unpack_triwords(register)[0] for register in registers], program_counter, mode
+
+    def put(self, key, registers, program_counter, mode):
+        """Store a final register file under key."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(_ENTRY.pack(program_counter, MODES.index(mode), len(registers)))
+                file.write(np.array([len(register) for register in registers], dtype="<u4").tobytes())
+                dump_trits(file, triword_values(registers))
+            os.replace(tmp, path)  # Readers see either no entry or a complete one
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._puts += 1
+        if self._puts % self.evict_interval == 0:
+            self.evict()
+
+    def _entries(self):
+        """Return (mtime, size, path) for every stored entry."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".trit"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted by another process
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        """Return the total size of stored entries in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with open(os.path.join(self.directory, ".lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entries = sorted(self._entries())
+                total = sum(size for _, size, _ in entries)
+                removed = 0
+                for _, size, path in entries:
+                    if total <= self.max_bytes:
+                        break
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    removed += 1
+                return removed
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def execute(self, cpu, program):
+        """Run program on cpu, reusing a cached result when one exists."""
+        key = program_key(program, cpu.registers, cpu.program_counter, cpu.computation_mode)
+        cached = self.get(key)
+        if cached is not None:
+            cpu.registers, cpu.program_counter, cpu.computation_mode = cached
+            return True
+        cpu.execute(program)
+        self.put(key, cpu.registers, cpu.program_counter, cpu.computation_mode)
+        return False
+
+
+# Example usage of the result cache
+if __name__ == "__main__":
+    import time
+
+    from trinary_simulator import TrinaryCPU
+
+    program = [
+        {"opcode": "LOAD", "value": [1, 0, -1, 1] * 64, "dest": 0},
+        {"opcode": "LOAD", "value": [0, 1, -1, 0] * 64, "dest": 1},
+    ] + [{"opcode": "ADD", "src1": 0, "src2": 1, "dest": 2}] * 50 + [{"opcode": "HALT"}]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(tmp)
+        for attempt in ("miss", "hit"):
+            cpu = TrinaryCPU(register_size=256)
+            started = time.perf_counter()
+            hit = cache.execute(cpu, program)
+            print(f"{attempt}: cached={hit} in {(time.perf_counter() - started) * 1e6:.0f}us")
+        reference = TrinaryCPU(register_size=256)
+        reference.execute(program)
+        print("Cached registers match a fresh run:", repr(cpu.registers) == repr(reference.registers))
+
+        key = program_key(program, TrinaryCPU(register_size=256).registers)
+        for name, lookup in (("program_key", lambda: program_key(program, cpu.registers)),
+                             ("get", lambda: cache.get(key)),
+                             ("get_packed", lambda: cache.get_packed(key))):
+            started = time.perf_counter()
+            for _ in range(100):
+                lookup()
+            print(f"{name}: {(time.perf_counter() - started) * 1e4:.0f}us per call")
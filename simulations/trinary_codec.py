@@ -0,0 +1,214 @@
+"""
+Dense Trit Storage Codec
+
+This module packs trits close to their information-theoretic size: five
+trits per byte (3**5 = 243 <= 256) or twenty trits per 32-bit word
+(3**20 = 3486784401 < 2**32), instead of one Python Trit object each. It also
+defines a small file format so register files, traces and memory images can
+be persisted in packed form.
+"""
+
+import struct
+
+import numpy as np
+
+from trinary_arrays import as_trit_array, pack_triwords, unpack_triwords
+
+BYTE_PACKING = 5
+WORD_PACKING = 20
+MAGIC = b"TRIT"
+
+# Block header: magic, packing, ndim; followed by ndim uint64 dimensions
+_HEADER = struct.Struct("<4sBB")
+_DIM = struct.Struct("<Q")
+_COUNT = struct.Struct("<I")
+
+_BYTE_PLACES = 3 ** np.arange(BYTE_PACKING, dtype=np.int64)
+_WORD_PLACES = 3 ** np.arange(WORD_PACKING, dtype=np.int64)
+_HALF_WORD = 3 ** (WORD_PACKING // 2)
+# Groups per chunk, bounding the temporary memory of encode() and decode()
+CHUNK_GROUPS = 1 << 18
+_tables = {}
+
+
+def _digit_table(packing):
+    """Return the (3**packing, packing) table of trits for every packed value."""
+    if packing not in _tables:
+        values = np.arange(3 ** packing, dtype=np.int64)
+        table = np.empty((values.size, packing), dtype=np.int8)
+        for column in range(packing):
+            table[:, column] = values % 3 - 1
+            values //= 3
+        _tables[packing] = table
+    return _tables[packing]
+
+
+def packed_size(count, packing=BYTE_PACKING):
+    """Return the number of bytes needed to store count trits."""
+    if packing == BYTE_PACKING:
+        return -(-count // BYTE_PACKING)
+    if packing == WORD_PACKING:
+        return -(-count // WORD_PACKING) * 4
+    raise ValueError("Packing must be 5 (per byte) or 20 (per 32-bit word)")
+
+
+def _packed_dtype(packing):
+    """Return the storage type of one packed group, validating packing."""
+    if packing == BYTE_PACKING:
+        return np.dtype(np.uint8)
+    if packing == WORD_PACKING:
+        return np.dtype(np.uint32)
+    raise ValueError("Packing must be 5 (per byte) or 20 (per 32-bit word)")
+
+
+def _encode_groups(block, out):
+    """Pack a (groups, packing) trit block into out, one packed value per row."""
+    out[:] = 0
+    digit = np.empty(len(block), dtype=out.dtype)
+    for column, place in enumerate(_BYTE_PLACES if block.shape[1] == BYTE_PACKING else _WORD_PLACES):
+        np.add(block[:, column], 1, out=digit, casting="unsafe")
+        digit *= out.dtype.type(place)
+        out += digit
+
+
+def encode(trits, packing=BYTE_PACKING):
+    """Pack a trit array into bytes (packing=5) or uint32 words (packing=20).
+
+    The trits are flattened and padded with zeros to a whole group; keep the
+    original count (or shape) to decode them again. Work is done in chunks
+    of CHUNK_GROUPS groups, so the only full-size allocation is the output.
+    """
+    dtype = _packed_dtype(packing)
+    trits = np.asarray(trits).reshape(-1)
+    full, tail = divmod(trits.size, packing)
+    out = np.empty(full + bool(tail), dtype=dtype)
+    for start in range(0, full, CHUNK_GROUPS):
+        stop = min(start + CHUNK_GROUPS, full)
+        block = as_trit_array(trits[start * packing:stop * packing])
+        _encode_groups(block.reshape(-1, packing), out[start:stop])
+    if tail:
+        last = np.zeros(packing, dtype=np.int8)  # Padding encodes trit 0
+        last[:tail] = as_trit_array(trits[full * packing:])
+        _encode_groups(last.reshape(1, packing), out[full:])
+    return out
+
+
+def _as_packed_array(packed, dtype):
+    """View packed data from an array or any buffer-protocol object as dtype.
+
+    Byte arrays (e.g. np.fromfile(path, np.uint8) or a uint8 memmap) are
+    reinterpreted, so word-packed images can be read back from raw bytes.
+    """
+    if isinstance(packed, np.ndarray):
+        packed = packed.reshape(-1)
+        if packed.dtype == dtype:
+            return packed
+        if packed.dtype.itemsize == 1:
+            if packed.size % dtype.itemsize:
+                raise ValueError(f"Packed data is not a whole number of {dtype.itemsize}-byte groups")
+            return np.ascontiguousarray(packed).view(np.uint8).view(dtype)
+        raise ValueError(f"Packed data must be {dtype} values or raw bytes, not {packed.dtype}")
+    return np.frombuffer(memoryview(packed).cast("B"), dtype=dtype)
+
+
+def _decode_groups(packed, packing, out):
+    """Unpack a chunk of packed values into out, a (groups, packing) int8 array."""
+    if packing == BYTE_PACKING:
+        if packed.size and packed.max() >= 3 ** BYTE_PACKING:
+            raise ValueError("Corrupt packed data: byte value out of range")
+        np.take(_digit_table(BYTE_PACKING), packed, axis=0, out=out)
+    else:
+        if packed.size and packed.max() >= 3 ** WORD_PACKING:
+            raise ValueError("Corrupt packed data: word value out of range")
+        # Split each word into two 10-trit halves and decode both by table lookup
+        half = WORD_PACKING // 2
+        table = _digit_table(half)
+        np.take(table, packed % _HALF_WORD, axis=0, out=out[:, :half])
+        np.take(table, packed // _HALF_WORD, axis=0, out=out[:, half:])
+
+
+def decode(packed, count, packing=BYTE_PACKING):
+    """Unpack count trits from bytes or uint32 words produced by encode()."""
+    dtype = _packed_dtype(packing)
+    packed = _as_packed_array(packed, dtype.newbyteorder("<") if packing == WORD_PACKING else dtype)
+    groups = -(-count // packing)
+    if groups > packed.size:
+        raise ValueError("Packed data holds fewer trits than requested")
+    trits = np.empty(groups * packing, dtype=np.int8)
+    rows = trits.reshape(groups, packing)
+    for start in range(0, groups, CHUNK_GROUPS):
+        stop = min(start + CHUNK_GROUPS, groups)
+        _decode_groups(packed[start:stop], packing, rows[start:stop])
+    return trits[:count]
+
+
+def dump_trits(file, trits, packing=BYTE_PACKING):
+    """Write a trit array of any shape to an open binary file as one block."""
+    trits = np.asarray(trits)
+    packed = encode(trits, packing)
+    file.write(_HEADER.pack(MAGIC, packing, trits.ndim))
+    for dim in trits.shape:
+        file.write(_DIM.pack(dim))
+    file.write(packed.astype("<u4" if packing == WORD_PACKING else np.uint8, copy=False).data)
+
+
+def read_trits(file):
+    """Read one block written by dump_trits() and return the trit array."""
+    magic, packing, ndim = _HEADER.unpack(file.read(_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a packed trit file")
+    shape = tuple(_DIM.unpack(file.read(_DIM.size))[0] for _ in range(ndim))
+    count = int(np.prod(shape, dtype=np.int64))
+    data = file.read(packed_size(count, packing))
+    return decode(data, count, packing).reshape(shape)
+
+
+def save_trits(path, trits, packing=BYTE_PACKING):
+    """Save a trit array (memory image, trace, ...) to path in packed form."""
+    with open(path, "wb") as file:
+        dump_trits(file, trits, packing)
+
+
+def load_trits(path):
+    """Load a trit array saved with save_trits()."""
+    with open(path, "rb") as file:
+        return read_trits(file)
+
+
+def save_registers(path, registers, packing=BYTE_PACKING):
+    """Save a register file (a list of TriWords, e.g. cpu.registers) to path."""
+    with open(path, "wb") as file:
+        file.write(_COUNT.pack(len(registers)))
+        for register in registers:
+            dump_trits(file, pack_triwords([register]).reshape(-1), packing)
+
+
+def load_registers(path):
+    """Load a register file saved with save_registers() as a list of TriWords."""
+    with open(path, "rb") as file:
+        (count,) = _COUNT.unpack(file.read(_COUNT.size))
+        return [unpack_triwords(read_trits(file))[0] for _ in range(count)]
+
+
+# Example usage of the codec
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from trinary_simulator import TrinaryCPU
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(-1, 2, size=1_000_000, dtype=np.int8)
+    for packing in (BYTE_PACKING, WORD_PACKING):
+        packed = encode(image, packing)
+        restored = decode(packed, image.size, packing)
+        print(f"{packing} trits per group: {packed.nbytes} bytes "
+              f"({packed.nbytes * 8 / image.size:.2f} bits/trit), lossless={np.array_equal(image, restored)}")
+
+    cpu = TrinaryCPU(register_size=4)
+    cpu.execute([{"opcode": "LOAD", "value": [1, 0, -1, 1], "dest": 0}])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "registers.trit")
+        save_registers(path, cpu.registers)
+        print("Register file on disk:", os.path.getsize(path), "bytes")
+        print("Register 0 after reload:", load_registers(path)[0])
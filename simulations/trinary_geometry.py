@@ -0,0 +1,211 @@
+"""
+Trinary Geometry Kernels
+
+This module runs the TriPoint / TriTriangle operations from
+examples/applications/vr_simulation.md over structure-of-arrays meshes:
+magnitudes, cross products and three-state visibility culling are computed
+for millions of vertices per call instead of one register at a time.
+
+Classifications use the trinary convention of the VR example:
+-1 backface / outside, 0 edge-on / partially inside, 1 frontface / inside.
+"""
+
+import numpy as np
+
+from trinary_arrays import to_decimal
+
+# Triangles are classified in batches of this many to bound temporary memory
+DEFAULT_BATCH = 1 << 20
+
+
+class TriPointArray:
+    """Structure-of-arrays storage for many TriPoints."""
+
+    def __init__(self, x, y, z):
+        """Initialize from equal-length coordinate arrays."""
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.z = np.asarray(z, dtype=np.float64)
+        if not (self.x.shape == self.y.shape == self.z.shape):
+            raise ValueError("Coordinate arrays must have the same shape")
+
+    @classmethod
+    def from_triwords(cls, x, y, z):
+        """Build points from packed (count, width) TriWord coordinate arrays."""
+        return cls(to_decimal(x), to_decimal(y), to_decimal(z))
+
+    def __len__(self):
+        """Return the number of points."""
+        return self.x.size
+
+    def stack(self):
+        """Return the points as a (count, 3) array."""
+        return np.stack((self.x, self.y, self.z), axis=1)
+
+    def squared_magnitudes(self):
+        """Return x*x + y*y + z*z for every point."""
+        return self.x * self.x + self.y * self.y + self.z * self.z
+
+    def magnitudes(self):
+        """Return the Euclidean length of every point."""
+        return np.sqrt(self.squared_magnitudes())
+
+
+class TriMesh:
+    """A triangle mesh of TriPoint vertices and (count, 3) vertex indices."""
+
+    def __init__(self, vertices, triangles):
+        """Initialize the mesh from a TriPointArray and triangle index array."""
+        self.vertices = vertices
+        self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        if self.triangles.size and (self.triangles.min() < 0 or self.triangles.max() >= len(vertices)):
+            raise ValueError("Triangle index out of range")
+
+    def __len__(self):
+        """Return the number of triangles."""
+        return len(self.triangles)
+
+    def corners(self, start=0, stop=None):
+        """Return the three (count, 3) corner arrays for a range of triangles.
+
+        Only the vertices of those triangles are gathered, so the temporary
+        memory is proportional to the range, not to the vertex count.
+        """
+        vertices = self.vertices
+        indices = self.triangles[start:stop]
+        return tuple(np.stack((vertices.x[corner], vertices.y[corner], vertices.z[corner]), axis=1)
+                     for corner in indices.T)
+
+    def normals(self, start=0, stop=None):
+        """Return the unnormalized normal (v1 - v0) x (v2 - v0) of each triangle."""
+        v0, v1, v2 = self.corners(start, stop)
+        return np.cross(v1 - v0, v2 - v0)
+
+    def centroids(self, start=0, stop=None):
+        """Return the centroid of each triangle."""
+        v0, v1, v2 = self.corners(start, stop)
+        return (v0 + v1 + v2) / 3.0
+
+
+def cross(a, b):
+    """Batched cross product of two TriPointArrays."""
+    return TriPointArray(a.y * b.z - a.z * b.y, a.z * b.x - a.x * b.z, a.x * b.y - a.y * b.x)
+
+
+def dot(a, b):
+    """Batched dot product of two TriPointArrays."""
+    return a.x * b.x + a.y * b.y + a.z * b.z
+
+
+def sign_with_tolerance(values, tolerance=1e-9):
+    """Map values to -1/0/1, treating magnitudes within tolerance as 0."""
+    return np.where(values > tolerance, 1, np.where(values < -tolerance, -1, 0)).astype(np.int8)
+
+
+def frustum_planes(position, forward, up, fov_y, aspect, near, far):
+    """Return the six inward-facing frustum planes as a (6, 4) array (normal, offset).
+
+    A point p is inside a plane when dot(normal, p) + offset >= 0.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    forward = np.asarray(forward, dtype=np.float64)
+    forward = forward / np.linalg.norm(forward)
+    right = np.cross(forward, np.asarray(up, dtype=np.float64))
+    right = right / np.linalg.norm(right)
+    up = np.cross(right, forward)
+
+    half_v = np.tan(fov_y / 2.0)
+    half_h = half_v * aspect
+    normals = [
+        forward,                                            # near
+        -forward,                                           # far
+        np.cross(up, forward + right * half_h),             # right
+        np.cross(forward - right * half_h, up),             # left
+        np.cross(forward + up * half_v, right),             # top
+        np.cross(right, forward - up * half_v),             # bottom
+    ]
+    planes = np.zeros((6, 4))
+    for i, normal in enumerate(normals):
+        normal = normal / np.linalg.norm(normal)
+        planes[i, :3] = normal
+        planes[i, 3] = -normal @ position
+    planes[0, 3] -= near
+    planes[1, 3] += far
+    return planes
+
+
+def _backface_states(corners, camera, tolerance):
+    """Classify one batch of triangle corners against the camera position."""
+    v0, v1, v2 = corners
+    facing = np.einsum("ij,ij->i", np.cross(v1 - v0, v2 - v0), camera - v0)
+    return sign_with_tolerance(facing, tolerance)
+
+
+def _frustum_states(corners, planes):
+    """Classify one batch of triangle corners against the frustum planes."""
+    corners = np.stack(corners, axis=1)                          # (n, 3 corners, 3)
+    distances = corners @ planes[:, :3].T + planes[:, 3]         # (n, 3 corners, 6 planes)
+    inside = distances >= 0
+    outside_any_plane = (~inside).all(axis=1).any(axis=1)
+    fully_inside = inside.all(axis=(1, 2))
+    return np.where(outside_any_plane, -1, np.where(fully_inside, 1, 0)).astype(np.int8)
+
+
+def _classify(mesh, classify, batch):
+    """Apply classify to the corners of each batch of triangles."""
+    result = np.empty(len(mesh), dtype=np.int8)
+    for start in range(0, len(mesh), batch):
+        stop = min(start + batch, len(mesh))
+        result[start:stop] = classify(mesh.corners(start, stop))
+    return result
+
+
+def classify_backfaces(mesh, camera, tolerance=1e-9, batch=DEFAULT_BATCH):
+    """Classify triangles as facing the camera (1), edge-on (0) or backfacing (-1)."""
+    camera = np.asarray(camera, dtype=np.float64)
+    return _classify(mesh, lambda corners: _backface_states(corners, camera, tolerance), batch)
+
+
+def classify_frustum(mesh, planes, batch=DEFAULT_BATCH):
+    """Classify triangles as inside (1), crossing (0) or outside (-1) the frustum."""
+    planes = np.asarray(planes, dtype=np.float64)
+    return _classify(mesh, lambda corners: _frustum_states(corners, planes), batch)
+
+
+def classify_visibility(mesh, camera, planes, tolerance=1e-9, batch=DEFAULT_BATCH):
+    """Combine frustum and backface tests into one trinary visibility state.
+
+    -1: culled (outside the frustum or backfacing), 0: partial (crossing the
+    frustum or edge-on), 1: fully visible front face. Each batch's corners
+    are gathered once and shared by both tests.
+    """
+    camera = np.asarray(camera, dtype=np.float64)
+    planes = np.asarray(planes, dtype=np.float64)
+    return _classify(mesh, lambda corners: np.minimum(  # AND₃ of the two tests
+        _frustum_states(corners, planes), _backface_states(corners, camera, tolerance)), batch)
+
+
+# Example usage of the geometry kernels
+if __name__ == "__main__":
+    import time
+
+    # The coordinates from the VR program in trinary_simulator.py
+    points = TriPointArray.from_triwords(
+        np.array([[1], [0], [-1], [1]], dtype=np.int8),
+        np.array([[-1], [1], [0], [-1]], dtype=np.int8),
+        np.array([[0], [-1], [1], [0]], dtype=np.int8),
+    )
+    print("Squared magnitudes:", points.squared_magnitudes())
+
+    rng = np.random.default_rng(0)
+    count = 1_000_000
+    vertices = TriPointArray(*rng.uniform(-10, 10, size=(3, count)))
+    mesh = TriMesh(vertices, rng.integers(0, count, size=(count, 3)))
+    planes = frustum_planes(position=(0, 0, -20), forward=(0, 0, 1), up=(0, 1, 0),
+                            fov_y=np.pi / 3, aspect=16 / 9, near=0.1, far=100)
+
+    started = time.perf_counter()
+    states = classify_visibility(mesh, camera=(0, 0, -20), planes=planes)
+    elapsed = time.perf_counter() - started
+    print(f"Classified {count} triangles in {elapsed:.3f}s:",
+          {state: int(np.count_nonzero(states == state)) for state in (-1, 0, 1)})
@@ -0,0 +1,162 @@
+"""
+Binary Import and Export
+
+This module implements the import_binary/export_binary compatibility features
+described in software/trinary_language.md. Both directions accept and return
+buffer-protocol objects and work in fixed-size chunks through lookup tables,
+so no per-byte or per-trit Python objects are created.
+
+Three encodings are supported:
+
+- "flattened": one trit per bit. Import yields 0/1 trits; export applies
+  signal flattening (Trit.as_binary), so -1 and 1 both become a 1 bit.
+- "balanced": each byte, read as a signed value -128..127, becomes six
+  balanced-ternary trits (3**6 = 729 states). Export is the exact inverse,
+  so it only accepts byte images: groups of six trits worth -128..127.
+- "packed": five trits per byte, as in trinary_codec (3**5 = 243 states).
+  Export accepts any trit array, such as simulator registers, padding the
+  last byte with zero trits; import is the exact inverse of export.
+"""
+
+import numpy as np
+
+from trinary_arrays import as_trit_array
+from trinary_codec import BYTE_PACKING, decode, encode
+
+ENCODINGS = ("flattened", "balanced", "packed")
+BYTE_TRITS = 6
+CHUNK_BYTES = 1 << 22
+
+
+def _build_byte_table():
+    """Return the (256, 6) table of balanced-ternary digits for each byte."""
+    values = np.arange(256, dtype=np.int64).astype(np.uint8).view(np.int8).astype(np.int64)
+    table = np.zeros((256, BYTE_TRITS), dtype=np.int8)
+    for column in range(BYTE_TRITS - 1, -1, -1):
+        digit = values % 3
+        digit[digit == 2] = -1
+        table[:, column] = digit
+        values = (values - digit) // 3
+    return table
+
+
+_BYTE_TO_TRITS = _build_byte_table()
+_TRIT_PLACES = 3 ** np.arange(BYTE_TRITS - 1, -1, -1, dtype=np.int16)
+
+
+def _check_encoding(encoding):
+    if encoding not in ENCODINGS:
+        raise ValueError("Encoding must be flattened, balanced or packed")
+
+
+def _byte_view(buffer, writable=False):
+    """View any buffer-protocol object as a flat uint8 array without copying."""
+    view = memoryview(buffer)
+    if writable and view.readonly:
+        raise ValueError("Output buffer must be writable")
+    return np.frombuffer(view.cast("B"), dtype=np.uint8)
+
+
+def import_trit_count(nbytes, encoding="balanced"):
+    """Return the number of trits produced when importing nbytes of data."""
+    _check_encoding(encoding)
+    return nbytes * {"flattened": 8, "balanced": BYTE_TRITS, "packed": BYTE_PACKING}[encoding]
+
+
+def export_byte_count(ntrits, encoding="balanced"):
+    """Return the number of bytes produced when exporting ntrits."""
+    _check_encoding(encoding)
+    if encoding == "flattened":
+        return (ntrits + 7) // 8
+    if encoding == "packed":
+        return -(-ntrits // BYTE_PACKING)
+    if ntrits % BYTE_TRITS:
+        raise ValueError(f"Balanced export needs a multiple of {BYTE_TRITS} trits")
+    return ntrits // BYTE_TRITS
+
+
+def import_binary(data, encoding="balanced", out=None):
+    """Convert a bytes-like object into a flat int8 trit array.
+
+    If out is given it must be a writable buffer of import_trit_count() bytes;
+    trits are written into it and the returned array shares its memory.
+    """
+    _check_encoding(encoding)
+    source = _byte_view(data)
+    count = import_trit_count(source.size, encoding)
+    if out is None:
+        trits = np.empty(count, dtype=np.int8)
+    else:
+        trits = _byte_view(out, writable=True).view(np.int8)
+        if trits.size != count:
+            raise ValueError(f"Output buffer must hold exactly {count} trits")
+
+    per_byte = count // source.size if source.size else 0
+    for start in range(0, source.size, CHUNK_BYTES):
+        chunk = source[start:start + CHUNK_BYTES]
+        target = trits[start * per_byte:(start + chunk.size) * per_byte]
+        if encoding == "flattened":
+            target[:] = np.unpackbits(chunk)
+        elif encoding == "packed":
+            target[:] = decode(chunk, target.size)
+        else:
+            target.reshape(-1, BYTE_TRITS)[:] = _BYTE_TO_TRITS[chunk]
+    return trits
+
+
+def export_binary(trits, encoding="balanced", out=None):
+    """Convert a trit array (or buffer of int8 trits) into bytes.
+
+    Returns a memoryview over the result, which is out itself when a writable
+    buffer of export_byte_count() bytes is supplied.
+    """
+    _check_encoding(encoding)
+    if isinstance(trits, np.ndarray):
+        source = trits.reshape(-1)
+    else:
+        source = _byte_view(trits).view(np.int8)
+    count = export_byte_count(source.size, encoding)
+    if out is None:
+        result = np.empty(count, dtype=np.uint8)
+    else:
+        result = _byte_view(out, writable=True)
+        if result.size != count:
+            raise ValueError(f"Output buffer must hold exactly {count} bytes")
+
+    step = CHUNK_BYTES * {"flattened": 8, "balanced": BYTE_TRITS, "packed": BYTE_PACKING}[encoding]
+    for start in range(0, source.size, step):
+        chunk = source[start:start + step]
+        if encoding == "flattened":
+            chunk = as_trit_array(chunk)
+            result[start // 8:start // 8 + (chunk.size + 7) // 8] = np.packbits(chunk != 0)
+        elif encoding == "packed":
+            first = start // BYTE_PACKING
+            result[first:first + -(-chunk.size // BYTE_PACKING)] = encode(chunk)
+        else:
+            if chunk.min() < -1 or chunk.max() > 1:
+                raise ValueError("Trit value must be -1, 0, or 1")
+            values = chunk.reshape(-1, BYTE_TRITS).astype(np.int16) @ _TRIT_PLACES
+            if values.min() < -128 or values.max() > 127:
+                raise ValueError("Trits do not encode a byte value (-128..127); use the packed encoding")
+            first = start // BYTE_TRITS
+            result[first:first + values.size] = values.astype(np.int8).view(np.uint8)
+    return memoryview(out) if out is not None else memoryview(result)
+
+
+# Example usage of binary import and export
+if __name__ == "__main__":
+    payload = bytes(range(256)) * 4096
+
+    trits = import_binary(payload)
+    restored = export_binary(trits)
+    print("Balanced round trip is lossless:", restored.tobytes() == payload)
+
+    register = np.array([1, 1, 1, 1, 1, 1, -1], dtype=np.int8)
+    packed = export_binary(register, "packed")
+    print("Packed export of", register.tolist(), "->", packed.tobytes(),
+          "->", import_binary(packed, "packed")[:register.size].tolist())
+
+    flat = import_binary(b"\x05", "flattened")
+    print("Flattened import of 0x05:", flat.tolist())
+    print("Flattened export of [1, 0, -1, 0, 0, 0, 0, 1]:",
+          export_binary(np.array([1, 0, -1, 0, 0, 0, 0, 1], dtype=np.int8), "flattened").tobytes())
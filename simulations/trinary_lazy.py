@@ -0,0 +1,293 @@
+"""
+Lazy Trinary Expressions
+
+This module lets chains of element-wise TriWord operations (+, *, &, |,
+negation, absolute value) build an expression graph instead of materializing a
+TriWord of fresh Trit objects at every step. On evaluation the whole chain is
+fused into a single pass over packed int8 data:
+
+- identical subexpressions are hash-consed into one node and computed once;
+- when the expression reads few distinct inputs, it is compiled into a lookup
+  table over every combination of their trits, so evaluation reads each input
+  once and writes the result once with no intermediates at all;
+- otherwise it is evaluated in cache-sized chunks, so intermediates never
+  exceed one chunk.
+"""
+
+import itertools
+import weakref
+
+import numpy as np
+
+from trinary_simulator import TriWord
+
+# Largest number of distinct inputs compiled into a lookup table (3**8 entries)
+MAX_TABLE_INPUTS = 8
+CHUNK = 1 << 16
+
+_COMMUTATIVE = {"ADD", "MUL", "AND", "OR"}
+_kernel_cache = {}
+_KERNEL_CACHE_SIZE = 256
+
+
+def _apply(op, args):
+    """Evaluate one operation on int8 trit arrays, matching the Trit operators."""
+    if op == "ADD":
+        return ((args[0].astype(np.int16) + args[1] + 1) % 3 - 1).astype(np.int8)
+    if op == "MUL":
+        return args[0] * args[1]
+    if op == "AND":
+        return np.minimum(args[0], args[1])
+    if op == "OR":
+        return np.maximum(args[0], args[1])
+    if op == "NEG":
+        return -args[0]
+    if op == "ABS":
+        return np.abs(args[0])
+    raise ValueError(f"Unknown operation: {op}")
+
+
+class LazyTriWord:
+    """A node in a lazily evaluated graph of element-wise TriWord operations.
+
+    Nodes are hash-consed: building the same operation on the same operands
+    (in either order, for commutative operations) returns the existing node,
+    so shared subexpressions are one node however the graph was written.
+    """
+
+    __slots__ = ("op", "args", "data", "value", "id", "__weakref__")
+
+    def __init__(self, op, args=(), data=None, value=None):
+        """Create a node; use lazy() to wrap existing data."""
+        self.op = op
+        self.args = args
+        self.data = data
+        self.value = value
+        self.id = next(_ids)
+
+    def _wrap(self, other):
+        if isinstance(other, LazyTriWord):
+            return other
+        if isinstance(other, int):
+            if other not in (-1, 0, 1):
+                raise ValueError("Trit value must be -1, 0, or 1")
+            return _node("CONST", value=other)
+        return lazy(other)
+
+    def __add__(self, other):
+        return _node("ADD", (self, self._wrap(other)))
+
+    def __mul__(self, other):
+        return _node("MUL", (self, self._wrap(other)))
+
+    def __and__(self, other):
+        return _node("AND", (self, self._wrap(other)))
+
+    def __or__(self, other):
+        return _node("OR", (self, self._wrap(other)))
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+    __rand__ = __and__
+    __ror__ = __or__
+
+    def __neg__(self):
+        return _node("NEG", (self,))
+
+    def abs_value(self):
+        """Lazy element-wise absolute value."""
+        return _node("ABS", (self,))
+
+    def __len__(self):
+        """Return the number of trits the expression produces."""
+        lengths = {len(node.data) for node in self.inputs()}
+        if len(lengths) > 1:
+            raise ValueError("All TriWords in an expression must have the same length")
+        return lengths.pop() if lengths else 1
+
+    def __repr__(self):
+        return f"LazyTriWord({self.op}, inputs={len(self.inputs())})"
+
+    def inputs(self):
+        """Return the distinct input nodes in first-use order."""
+        return [node for node in _topological([self]) if node.op == "INPUT"]
+
+    def evaluate(self):
+        """Evaluate the fused expression and return an int8 trit array."""
+        return evaluate(self)[0]
+
+    def to_triword(self):
+        """Evaluate the expression into a regular TriWord."""
+        return TriWord(self.evaluate().tolist())
+
+
+_ids = itertools.count()
+# Live nodes by structural key (op, operand ids...); entries vanish with their node
+_interned = weakref.WeakValueDictionary()
+
+
+def _node(op, args=(), data=None, value=None):
+    """Return the node for an operation, reusing an identical existing node."""
+    if op == "INPUT":
+        key = ("INPUT", id(data))  # The node keeps data alive, so its id stays unique
+    elif op == "CONST":
+        key = ("CONST", value)
+    else:
+        ids = tuple(arg.id for arg in args)
+        key = (op,) + (tuple(sorted(ids)) if op in _COMMUTATIVE else ids)
+    node = _interned.get(key)
+    if node is None:
+        node = LazyTriWord(op, args, data, value)
+        _interned[key] = node
+    return node
+
+
+def lazy(word):
+    """Wrap a TriWord or trit array as a lazy expression input."""
+    if isinstance(word, LazyTriWord):
+        return word
+    if isinstance(word, TriWord):
+        data = np.array([trit.value for trit in word], dtype=np.int8)
+    else:
+        data = np.ascontiguousarray(word, dtype=np.int8).reshape(-1)
+        if data.size and (data.min() < -1 or data.max() > 1):
+            raise ValueError("Trit value must be -1, 0, or 1")
+    return _node("INPUT", data=data)
+
+
+def _topological(exprs):
+    """Return every distinct node reachable from exprs, operands before their users."""
+    order = []
+    seen = set()
+    for root in exprs:
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if node.id in seen:
+                continue
+            seen.add(node.id)
+            stack.append((node, True))
+            stack.extend((arg, False) for arg in reversed(node.args) if arg.id not in seen)
+    return order
+
+
+def _evaluate_nodes(order, env, keep):
+    """Evaluate nodes in topological order and return the values of the nodes in keep.
+
+    Each node is computed once; intermediate values are dropped after their
+    last use.
+    """
+    last_use = {}
+    for position, node in enumerate(order):
+        for arg in node.args:
+            last_use[arg.id] = position
+    values = {}
+    for position, node in enumerate(order):
+        if node.op == "INPUT":
+            values[node.id] = env[node.id]
+        elif node.op == "CONST":
+            values[node.id] = np.int8(node.value)
+        else:
+            values[node.id] = _apply(node.op, [values[arg.id] for arg in node.args])
+            for arg in node.args:
+                if last_use[arg.id] == position and arg.id not in keep:
+                    values.pop(arg.id, None)
+    return {node_id: values[node_id] for node_id in keep}
+
+
+def _canonical_key(order, exprs):
+    """Describe the graph's structure independently of the input arrays.
+
+    The key is flat: one entry per node, with operands referred to by their
+    position in order, so its size is linear in the number of nodes.
+    """
+    position = {node.id: i for i, node in enumerate(order)}
+    inputs = 0
+    entries = []
+    for node in order:
+        if node.op == "INPUT":
+            entries.append(("IN", inputs))
+            inputs += 1
+        elif node.op == "CONST":
+            entries.append(("CONST", node.value))
+        else:
+            entries.append((node.op,) + tuple(position[arg.id] for arg in node.args))
+    return tuple(entries), tuple(position[expr.id] for expr in exprs)
+
+
+def _compile_tables(order, exprs, inputs):
+    """Build one lookup table per expression over all input trit combinations."""
+    key = _canonical_key(order, exprs)
+    tables = _kernel_cache.get(key)
+    if tables is None:
+        count = len(inputs)
+        combos = np.indices((3,) * count, dtype=np.int8).reshape(count, -1) - 1
+        # Input i is digit i of the table index (most significant first)
+        env = {node.id: combos[i] for i, node in enumerate(inputs)}
+        values = _evaluate_nodes(order, env, {expr.id for expr in exprs})
+        tables = [np.broadcast_to(values[expr.id], combos.shape[1:]).astype(np.int8) for expr in exprs]
+        if len(_kernel_cache) >= _KERNEL_CACHE_SIZE:
+            _kernel_cache.pop(next(iter(_kernel_cache)))
+        _kernel_cache[key] = tables
+    return tables
+
+
+def evaluate(*exprs, chunk=CHUNK):
+    """Evaluate one or more lazy expressions in a single fused pass.
+
+    Subexpressions shared between the expressions are computed once.
+    Returns a list of int8 arrays, one per expression.
+    """
+    exprs = [lazy(expr) if not isinstance(expr, LazyTriWord) else expr for expr in exprs]
+    order = _topological(exprs)
+    inputs = [node for node in order if node.op == "INPUT"]
+    lengths = {len(node.data) for node in inputs}
+    if len(lengths) > 1:
+        raise ValueError("All TriWords in an expression must have the same length")
+    length = lengths.pop() if lengths else 1
+    outputs = [np.empty(length, dtype=np.int8) for _ in exprs]
+
+    if len(inputs) <= MAX_TABLE_INPUTS:
+        tables = _compile_tables(order, exprs, inputs)
+        places = 3 ** np.arange(len(inputs) - 1, -1, -1, dtype=np.int32)
+        for start in range(0, length, chunk):
+            stop = min(start + chunk, length)
+            index = np.zeros(stop - start, dtype=np.int32)
+            for place, node in zip(places, inputs):
+                index += (node.data[start:stop] + 1) * place
+            for output, table in zip(outputs, tables):
+                output[start:stop] = table[index]
+        return outputs
+
+    keep = {expr.id for expr in exprs}
+    for start in range(0, length, chunk):
+        stop = min(start + chunk, length)
+        env = {node.id: node.data[start:stop] for node in inputs}
+        values = _evaluate_nodes(order, env, keep)
+        for output, expr in zip(outputs, exprs):
+            output[start:stop] = values[expr.id]
+    return outputs
+
+
+# Example usage of lazy expressions
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    size = 5_000_000
+    a, b, c = (lazy(rng.integers(-1, 2, size=size, dtype=np.int8)) for _ in range(3))
+
+    expression = ((a + b) * c).abs_value() | (a & -c)
+    started = time.perf_counter()
+    fused = expression.evaluate()
+    print(f"Fused evaluation of {size} trits: {time.perf_counter() - started:.3f}s")
+
+    x, y = a.data, c.data
+    eager = np.maximum(np.abs(_apply("ADD", [x, b.data]) * y), np.minimum(x, -y))
+    print("Matches eager evaluation:", bool(np.array_equal(fused, eager)))
+
+    word = lazy(TriWord([1, 0, -1, 1])) + lazy(TriWord([0, 1, -1, 0]))
+    print("Lazy TriWord addition:", word.to_triword())
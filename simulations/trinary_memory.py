@@ -0,0 +1,197 @@
+"""
+Memory Accounting
+
+This module reports how much memory the simulator's objects use: bytes per
+component for a TrinaryCPU, its registers and a TrifactoryEngine (including
+quantum registers), estimates per storage representation before anything is
+allocated, and a tracemalloc-backed measurement of peak usage during execute.
+"""
+
+import functools
+import math
+import sys
+import tracemalloc
+
+from trinary_simulator import TrifactoryEngine, TrinaryCPU, Trit, TriWord
+
+# Bytes per trit for the array-based representations used elsewhere in simulations/
+REPRESENTATIONS = {
+    "int8": 1.0,            # trinary_arrays, trinary_parallel
+    "bitplanes": 2 / 8,     # trinary_nn: positive and negative bit per trit
+    "packed5": 1 / 5,       # trinary_codec, 5 trits per byte
+    "packed20": 4 / 20,     # trinary_codec, 20 trits per 32-bit word
+}
+
+
+def _traced_bytes(factory, count=1000):
+    """Return the bytes tracemalloc attributes to each object factory() creates.
+
+    Measuring real allocations avoids sys.getsizeof(obj.__dict__), which on
+    Python 3.11+ builds an instance dictionary that did not exist before.
+    """
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objects = [factory() for _ in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+    return round((after - before - sys.getsizeof(objects)) / count)
+
+
+@functools.lru_cache(maxsize=None)
+def _object_costs():
+    """Return the measured bytes of one bare Trit, TriWord, TrinaryCPU and TrifactoryEngine.
+
+    The TriWord, CPU and engine costs exclude the lists and objects they
+    hold, which are accounted for separately.
+    """
+    cpu = TrinaryCPU(register_count=0, register_size=0)
+    return {
+        "trit": _traced_bytes(lambda: Trit(1)),
+        "triword": _traced_bytes(lambda: TriWord(length=0)) - sys.getsizeof([]),
+        "cpu": _traced_bytes(lambda: TrinaryCPU(register_count=0, register_size=0)) - sys.getsizeof([]),
+        "engine": _traced_bytes(lambda: TrifactoryEngine(cpu)),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _qutrit_state_cost(backend):
+    """Return the measured bytes of a QutritState apart from its amplitude and index data."""
+    from trinary_quantum import QutritState
+
+    state = QutritState(1, backend)
+    data = state.amplitudes.nbytes + (state.indices.nbytes if backend == "sparse" else 0)
+    return _traced_bytes(lambda: QutritState(1, backend), count=200) - data
+
+
+def trit_bytes():
+    """Return the memory used by one Trit object (its value is a cached small int)."""
+    return _object_costs()["trit"]
+
+
+def triword_bytes(word):
+    """Return the memory used by a TriWord, its trit list and its Trit objects."""
+    distinct = len({id(trit) for trit in word})  # The same Trit object may be stored more than once
+    return _object_costs()["triword"] + sys.getsizeof(word._trits) + distinct * trit_bytes()
+
+
+def cpu_footprint(cpu):
+    """Return a dict of bytes used by a TrinaryCPU and each of its registers."""
+    registers = [triword_bytes(register) for register in cpu.registers]
+    own = _object_costs()["cpu"] + sys.getsizeof(cpu.registers)
+    return {
+        "cpu": own,
+        "registers": sum(registers),
+        "per_register": registers,
+        "total": own + sum(registers),
+    }
+
+
+def quantum_register_bytes(register):
+    """Return the memory used by a TriWord or QutritState quantum register."""
+    if isinstance(register, TriWord):
+        return triword_bytes(register)
+    size = _qutrit_state_cost(register.backend) + register.amplitudes.nbytes
+    if register.backend == "sparse":
+        size += register.indices.nbytes
+    return size
+
+
+def engine_footprint(engine, quantum_registers=()):
+    """Return a dict of bytes used by a TrifactoryEngine, its CPU and quantum registers.
+
+    The engine does not keep the registers it creates, so pass the ones to
+    account for.
+    """
+    cpu = cpu_footprint(engine.cpu)
+    quantum = [quantum_register_bytes(register) for register in quantum_registers]
+    own = _object_costs()["engine"]
+    return {
+        "engine": own,
+        "cpu": cpu,
+        "quantum_registers": sum(quantum),
+        "per_quantum_register": quantum,
+        "total": own + cpu["total"] + sum(quantum),
+    }
+
+
+def estimate_registers(register_count, register_size, representation="triword"):
+    """Estimate the bytes a register file needs before allocating it.
+
+    representation is "triword" (TrinaryCPU's Trit objects) or one of the
+    array representations in REPRESENTATIONS.
+    """
+    trits = register_count * register_size
+    if representation == "triword":
+        per_word = _object_costs()["triword"] + sys.getsizeof([None] * register_size)
+        return register_count * per_word + trits * trit_bytes() + sys.getsizeof([None] * register_count)
+    if representation not in REPRESENTATIONS:
+        raise ValueError(f"Unknown representation: {representation}")
+    return math.ceil(trits * REPRESENTATIONS[representation])
+
+
+def estimate_qutrits(count, backend="dense", nonzero=None):
+    """Estimate the bytes of an n-qutrit state: 3**n amplitudes dense, or nonzero entries sparse."""
+    if backend == "dense":
+        return 16 * 3 ** count
+    if backend == "sparse":
+        if nonzero is None:
+            raise ValueError("Sparse estimates need the expected number of non-zero amplitudes")
+        return 24 * nonzero  # complex128 amplitude + int64 index
+    raise ValueError("Backend must be dense or sparse")
+
+
+def trace_execute(cpu, instructions, **options):
+    """Run cpu.execute under tracemalloc and report the memory it used.
+
+    Returns a dict with the peak traced bytes during execution and the net
+    change in traced bytes afterwards. Inside a tracemalloc session started
+    elsewhere this needs tracemalloc.reset_peak(), i.e. Python 3.9+.
+    """
+    started_here = not tracemalloc.is_tracing()
+    if not started_here and not hasattr(tracemalloc, "reset_peak"):
+        raise RuntimeError("trace_execute inside an active tracemalloc session needs Python 3.9+")
+    if started_here:
+        tracemalloc.start()  # A fresh session starts with its peak at zero
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        if not started_here:
+            tracemalloc.reset_peak()
+        cpu.execute(instructions, **options)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+    return {"peak": peak - before, "retained": after - before}
+
+
+def format_bytes(size):
+    """Format a byte count for display."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+# Example usage of memory accounting
+if __name__ == "__main__":
+    cpu = TrinaryCPU(register_count=8, register_size=1024)
+    report = cpu_footprint(cpu)
+    print("CPU total:", format_bytes(report["total"]), "- per trit:", trit_bytes(), "bytes")
+
+    engine = TrifactoryEngine(cpu)
+    qutrits = engine.create_quantum_simulation(8, backend="dense")
+    print("Engine total with an 8-qutrit state:", format_bytes(engine_footprint(engine, [qutrits])["total"]))
+
+    for representation in ("triword",) + tuple(REPRESENTATIONS):
+        print(f"16 x 1e6-trit registers as {representation}:",
+              format_bytes(estimate_registers(16, 1_000_000, representation)))
+
+    program = [{"opcode": "LOAD", "value": [1] * 1024, "dest": 0},
+               {"opcode": "ADD", "src1": 0, "src2": 0, "dest": 1}]
+    traced = trace_execute(cpu, program)
+    print("execute peak:", format_bytes(traced["peak"]), "retained:", format_bytes(traced["retained"]))
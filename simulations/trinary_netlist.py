@@ -0,0 +1,268 @@
+"""
+Ternary Netlist Simulator
+
+This module simulates gate-level circuits built from the NOT₃/AND₃/OR₃ gates
+in hardware/circuit_design.md (plus trinary ADD, MUL and BUF). A netlist is
+levelized once; every evaluation then runs each gate over whole int8 arrays of
+input vectors, so exhaustive 3**n verification is a single pass. An
+incremental simulator re-evaluates only the fanout of inputs that change.
+"""
+
+import heapq
+
+import numpy as np
+
+from trinary_arrays import from_decimal
+
+
+def _add(*values):
+    """Trinary addition with wrap-around, matching Trit.__add__."""
+    total = np.add.reduce([v.astype(np.int16) for v in values])
+    return ((total + 1) % 3 - 1).astype(np.int8)
+
+
+def _mul(*values):
+    """Trinary multiplication, matching Trit.__mul__."""
+    return np.multiply.reduce(values).astype(np.int8)
+
+
+# Gate evaluators over int8 arrays; AND₃ is the minimum and OR₃ the maximum
+GATES = {
+    "BUF": (1, 1, lambda a: a.copy()),
+    "NOT": (1, 1, lambda a: -a),
+    "AND": (2, None, lambda *v: np.minimum.reduce(v)),
+    "OR": (2, None, lambda *v: np.maximum.reduce(v)),
+    "ADD": (2, None, _add),
+    "MUL": (2, None, _mul),
+}
+
+
+class Netlist:
+    """A directed acyclic graph of ternary gates."""
+
+    def __init__(self):
+        """Initialize an empty netlist."""
+        self.inputs = []
+        self.outputs = []
+        self.gates = {}  # net name -> (op, input net names)
+        self._order = None
+        self._level = None
+        self._fanout = None
+
+    def add_input(self, name):
+        """Declare a primary input net."""
+        self._check_new(name)
+        self.inputs.append(name)
+        self._order = None
+        return name
+
+    def add_gate(self, name, op, *inputs):
+        """Add a gate driving net `name` from the given input nets."""
+        if op not in GATES:
+            raise ValueError(f"Unknown gate: {op}")
+        min_inputs, max_inputs, _ = GATES[op]
+        if len(inputs) < min_inputs or (max_inputs is not None and len(inputs) > max_inputs):
+            raise ValueError(f"Gate {op} cannot take {len(inputs)} inputs")
+        self._check_new(name)
+        self.gates[name] = (op, tuple(inputs))
+        self._order = None
+        return name
+
+    def set_outputs(self, *names):
+        """Mark nets as primary outputs."""
+        self.outputs = list(names)
+
+    def _check_new(self, name):
+        if name in self.gates or name in self.inputs:
+            raise ValueError(f"Net already defined: {name}")
+
+    def levelize(self):
+        """Topologically order the gates once and cache the order and fanout."""
+        if self._order is not None:
+            return self._order
+        known = set(self.inputs) | set(self.gates)
+        fanout = {net: [] for net in known}
+        pending = {}
+        for name, (_, sources) in self.gates.items():
+            for source in sources:
+                if source not in known:
+                    raise ValueError(f"Gate {name} reads undefined net {source}")
+                fanout[source].append(name)
+            pending[name] = len(sources)
+
+        level = {net: 0 for net in self.inputs}
+        ready = list(self.inputs)
+        order = []
+        while ready:
+            net = ready.pop()
+            for sink in fanout[net]:
+                level[sink] = max(level.get(sink, 0), level[net] + 1)
+                pending[sink] -= 1
+                if pending[sink] == 0:
+                    order.append(sink)
+                    ready.append(sink)
+        if len(order) != len(self.gates):
+            raise ValueError("Netlist contains a combinational loop")
+        order.sort(key=level.__getitem__)
+        self._order = order
+        self._level = level
+        self._fanout = fanout
+        return order
+
+    def fanout(self, net):
+        """Return the gates that read net, levelizing first if the netlist changed."""
+        self.levelize()
+        return self._fanout[net]
+
+    def level(self, net):
+        """Return the logic level of net (0 for primary inputs)."""
+        self.levelize()
+        return self._level[net]
+
+    def evaluate(self, inputs, all_nets=False):
+        """Evaluate the netlist for arrays of input vectors.
+
+        inputs maps each input name to an int8 array (one entry per vector).
+        Returns the output nets, or every net when all_nets is True.
+        """
+        order = self.levelize()
+        values = {name: np.asarray(inputs[name], dtype=np.int8) for name in self.inputs}
+        for name in order:
+            op, sources = self.gates[name]
+            values[name] = GATES[op][2](*(values[source] for source in sources))
+        if all_nets:
+            return values
+        return {name: values[name] for name in self.outputs}
+
+    def exhaustive_inputs(self):
+        """Return all 3**n input vectors, one int8 column per input."""
+        n = len(self.inputs)
+        half = (3 ** n - 1) // 2
+        vectors = from_decimal(np.arange(-half, half + 1, dtype=np.int64), n)
+        return {name: np.ascontiguousarray(vectors[:, i]) for i, name in enumerate(self.inputs)}
+
+    def verify(self, reference):
+        """Check the outputs against reference(**inputs) over all 3**n input vectors.
+
+        reference receives the input arrays and returns a dict of expected
+        output arrays. Returns a dict of output name -> indices of mismatches.
+        """
+        inputs = self.exhaustive_inputs()
+        actual = self.evaluate(inputs)
+        expected = reference(**inputs)
+        return {name: np.flatnonzero(actual[name] != np.asarray(expected[name])) for name in self.outputs}
+
+
+class IncrementalSimulator:
+    """Event-driven re-evaluation of a netlist when only a few inputs change."""
+
+    def __init__(self, netlist, inputs):
+        """Evaluate the netlist once and keep the value of every net."""
+        self.netlist = netlist
+        self._order = netlist.levelize()
+        self.values = netlist.evaluate(inputs, all_nets=True)
+        self.evaluations = 0
+
+    def update(self, changes):
+        """Apply new values for some inputs and propagate only the resulting events.
+
+        Returns the set of nets whose value changed.
+        """
+        netlist = self.netlist
+        if netlist.levelize() is not self._order:
+            return self._rebuild(changes)
+        changed = set()
+        queue = []
+        queued = set()
+        for name, value in changes.items():
+            if name not in netlist.inputs:
+                raise ValueError(f"Not an input net: {name}")
+            value = np.asarray(value, dtype=np.int8)
+            if np.array_equal(value, self.values[name]):
+                continue
+            self.values[name] = value
+            changed.add(name)
+            for sink in netlist.fanout(name):
+                if sink not in queued:
+                    queued.add(sink)
+                    heapq.heappush(queue, (netlist.level(sink), sink))
+
+        # Gates are processed in level order, so each is evaluated at most once
+        while queue:
+            _, name = heapq.heappop(queue)
+            op, sources = netlist.gates[name]
+            value = GATES[op][2](*(self.values[source] for source in sources))
+            self.evaluations += 1
+            if np.array_equal(value, self.values[name]):
+                continue
+            self.values[name] = value
+            changed.add(name)
+            for sink in netlist.fanout(name):
+                if sink not in queued:
+                    queued.add(sink)
+                    heapq.heappush(queue, (netlist.level(sink), sink))
+        return changed
+
+    def _rebuild(self, changes):
+        """Re-evaluate every net after the netlist was edited; return the nets that changed."""
+        netlist = self.netlist
+        for name in changes:
+            if name not in netlist.inputs:
+                raise ValueError(f"Not an input net: {name}")
+        missing = [name for name in netlist.inputs if name not in changes and name not in self.values]
+        if missing:
+            raise ValueError(f"No value for new input nets: {', '.join(missing)}")
+        inputs = {name: changes[name] if name in changes else self.values[name] for name in netlist.inputs}
+        values = netlist.evaluate(inputs, all_nets=True)
+        self.evaluations += len(netlist.gates)
+        changed = {name for name, value in values.items()
+                   if name not in self.values or not np.array_equal(value, self.values[name])}
+        self.values = values
+        self._order = netlist.levelize()
+        return changed
+
+    def outputs(self):
+        """Return the current value of each output net."""
+        return {name: self.values[name] for name in self.netlist.outputs}
+
+
+# Example usage of the netlist simulator
+if __name__ == "__main__":
+    import time
+
+    # De Morgan's law for NOT₃/AND₃/OR₃, checked over all 3**3 input vectors
+    circuit = Netlist()
+    a, b, c = (circuit.add_input(name) for name in "abc")
+    circuit.add_gate("and_abc", "AND", a, b, c)
+    circuit.add_gate("lhs", "NOT", "and_abc")
+    circuit.add_gate("not_a", "NOT", a)
+    circuit.add_gate("not_b", "NOT", b)
+    circuit.add_gate("not_c", "NOT", c)
+    circuit.add_gate("rhs", "OR", "not_a", "not_b", "not_c")
+    circuit.set_outputs("lhs", "rhs")
+
+    def reference(a, b, c):
+        expected = -np.minimum(np.minimum(a, b), c)
+        return {"lhs": expected, "rhs": expected}
+
+    print("De Morgan mismatches:", {k: v.size for k, v in circuit.verify(reference).items()})
+
+    # Exhaustive evaluation of a 14-input AND₃/OR₃ tree (3**14 = 4782969 vectors)
+    tree = Netlist()
+    nets = [tree.add_input(f"x{i}") for i in range(14)]
+    level = 0
+    while len(nets) > 1:
+        op = "AND" if level % 2 == 0 else "OR"
+        paired = len(nets) // 2 * 2
+        nets = [tree.add_gate(f"g{level}_{i}", op, nets[i], nets[i + 1])
+                for i in range(0, paired, 2)] + nets[paired:]
+        level += 1
+    tree.set_outputs(nets[0])
+    vectors = tree.exhaustive_inputs()
+    started = time.perf_counter()
+    tree.evaluate(vectors)
+    print(f"Evaluated {3 ** 14} vectors in {time.perf_counter() - started:.3f}s")
+
+    sim = IncrementalSimulator(tree, vectors)
+    sim.update({"x0": np.zeros_like(vectors["x0"])})
+    print("Gates re-evaluated after changing one input:", sim.evaluations, "of", len(tree.gates))
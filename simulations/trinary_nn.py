@@ -0,0 +1,220 @@
+"""
+Ternary-Weight Neural Network Kernels
+
+This module provides inference kernels for the Trifactory Engine's "AI" task
+mode, where network weights are restricted to -1, 0 and 1 so every multiply
+becomes an add, a subtract or a skip. Weights are stored as positive and
+negative bitplanes (and can be persisted as dense packed trits with
+trinary_codec). Two dense kernels are provided:
+
+- masked accumulation for real-valued activations: each output sums the
+  inputs under its +1 weights and subtracts those under its -1 weights,
+  computed as one BLAS matmul against the precomputed (+1 mask - -1 mask)
+  matrix;
+- popcount for ternary activations: with both operands as bitplanes, a dot
+  product is four AND + popcount reductions.
+
+Convolutions lower to the dense kernels through im2col.
+"""
+
+import time
+
+import numpy as np
+
+from trinary_codec import BYTE_PACKING, decode, encode
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(values):
+        """Count set bits per byte (NumPy releases before bitwise_count)."""
+        return _POPCOUNT_TABLE[values]
+
+
+def ternarize(weights, threshold_ratio=0.7):
+    """Quantize float weights to {-1, 0, 1} with a per-output scale.
+
+    Weights with magnitude below threshold_ratio * mean(|w|) become 0 (the
+    usual ternary-weight-network rule); the scale is the mean magnitude of the
+    weights that survive, so scale * ternary approximates the original.
+    """
+    weights = np.asarray(weights, dtype=np.float32)
+    flat = weights.reshape(weights.shape[0], -1)
+    delta = threshold_ratio * np.abs(flat).mean(axis=1, keepdims=True)
+    trits = np.where(flat > delta, 1, np.where(flat < -delta, -1, 0)).astype(np.int8)
+    kept = np.abs(flat) * (trits != 0)
+    counts = np.maximum((trits != 0).sum(axis=1), 1)
+    scale = (kept.sum(axis=1) / counts).astype(np.float32)
+    return trits.reshape(weights.shape), scale
+
+
+def to_bitplanes(trits):
+    """Split a (rows, n) trit array into packed positive and negative bitplanes."""
+    trits = np.asarray(trits)
+    return np.packbits(trits > 0, axis=-1), np.packbits(trits < 0, axis=-1)
+
+
+class TernaryDense:
+    """A fully connected layer with ternary weights."""
+
+    def __init__(self, trits, scale=None, bias=None):
+        """Initialize from a (out_features, in_features) trit array."""
+        trits = np.asarray(trits, dtype=np.int8)
+        if trits.ndim != 2:
+            raise ValueError("Dense weights must have shape (out_features, in_features)")
+        if trits.size and (trits.min() < -1 or trits.max() > 1):
+            raise ValueError("Trit value must be -1, 0, or 1")
+        self.out_features, self.in_features = trits.shape
+        self.scale = np.ones(self.out_features, dtype=np.float32) if scale is None else np.asarray(scale, dtype=np.float32)
+        self.bias = None if bias is None else np.asarray(bias, dtype=np.float32)
+        self.positive, self.negative = to_bitplanes(trits)
+
+        # (+1 mask - -1 mask), transposed for x @ masks; exact in float32
+        self._masks = trits.T.astype(np.float32)
+        self._nonzero = int(np.count_nonzero(trits))
+
+    @classmethod
+    def from_float(cls, weights, bias=None, threshold_ratio=0.7):
+        """Quantize a float weight matrix into a ternary layer."""
+        trits, scale = ternarize(weights, threshold_ratio)
+        return cls(trits, scale, bias)
+
+    def trits(self):
+        """Return the weights as a (out_features, in_features) trit array."""
+        positive = np.unpackbits(self.positive, axis=-1, count=self.in_features).astype(np.int8)
+        negative = np.unpackbits(self.negative, axis=-1, count=self.in_features).astype(np.int8)
+        return positive - negative
+
+    def to_packed(self):
+        """Return the weights as dense packed trits (5 per byte) for persistence."""
+        return encode(self.trits(), BYTE_PACKING)
+
+    @classmethod
+    def from_packed(cls, packed, out_features, in_features, scale=None, bias=None):
+        """Rebuild a layer from to_packed() output."""
+        trits = decode(packed, out_features * in_features, BYTE_PACKING)
+        return cls(trits.reshape(out_features, in_features), scale, bias)
+
+    def nonzero_fraction(self):
+        """Return the fraction of weights that are not skipped."""
+        return self._nonzero / max(self.out_features * self.in_features, 1)
+
+    def forward(self, x):
+        """Apply the layer to real-valued inputs of shape (batch, in_features)."""
+        x = np.asarray(x, dtype=np.float32).reshape(-1, self.in_features)
+        return self._finish(x @ self._masks)
+
+    def forward_ternary(self, x_trits, batch=256):
+        """Apply the layer to ternary inputs of shape (batch, in_features) using popcounts."""
+        x_trits = np.asarray(x_trits, dtype=np.int8).reshape(-1, self.in_features)
+        out = np.empty((x_trits.shape[0], self.out_features), dtype=np.int32)
+        wp = self.positive[None, :, :]
+        wn = self.negative[None, :, :]
+        for start in range(0, x_trits.shape[0], batch):
+            xp, xn = to_bitplanes(x_trits[start:start + batch])
+            xp = xp[:, None, :]
+            xn = xn[:, None, :]
+            agree = _popcount(xp & wp).astype(np.int32).sum(-1) + _popcount(xn & wn).astype(np.int32).sum(-1)
+            disagree = _popcount(xp & wn).astype(np.int32).sum(-1) + _popcount(xn & wp).astype(np.int32).sum(-1)
+            out[start:start + batch] = agree - disagree
+        return self._finish(out.astype(np.float32))
+
+    def _finish(self, out):
+        """Apply the per-output scale and the bias."""
+        out *= self.scale
+        if self.bias is not None:
+            out += self.bias
+        return out
+
+
+class TernaryConv2d:
+    """A 2-D convolution with ternary weights, lowered to TernaryDense via im2col."""
+
+    def __init__(self, trits, scale=None, bias=None, stride=1, padding=0):
+        """Initialize from an (out_channels, in_channels, kh, kw) trit array."""
+        trits = np.asarray(trits, dtype=np.int8)
+        if trits.ndim != 4:
+            raise ValueError("Conv weights must have shape (out_channels, in_channels, kh, kw)")
+        self.out_channels, self.in_channels, self.kh, self.kw = trits.shape
+        self.stride = stride
+        self.padding = padding
+        self.dense = TernaryDense(trits.reshape(self.out_channels, -1), scale, bias)
+
+    @classmethod
+    def from_float(cls, weights, bias=None, stride=1, padding=0, threshold_ratio=0.7):
+        """Quantize float convolution weights into a ternary layer."""
+        trits, scale = ternarize(weights, threshold_ratio)
+        return cls(trits, scale, bias, stride, padding)
+
+    def _im2col(self, x):
+        """Return (batch * out_h * out_w, in_channels * kh * kw) patches and the output size."""
+        if self.padding:
+            p = self.padding
+            x = np.pad(x, ((0, 0), (0, 0), (p, p), (p, p)))
+        windows = np.lib.stride_tricks.sliding_window_view(x, (self.kh, self.kw), axis=(2, 3))
+        windows = windows[:, :, ::self.stride, ::self.stride]         # (b, c, oh, ow, kh, kw)
+        batch, _, out_h, out_w = windows.shape[:4]
+        patches = windows.transpose(0, 2, 3, 1, 4, 5).reshape(batch * out_h * out_w, -1)
+        return patches, (batch, out_h, out_w)
+
+    def _reshape(self, out, shape):
+        """Turn im2col rows back into a (batch, channels, height, width) array."""
+        batch, out_h, out_w = shape
+        return out.reshape(batch, out_h, out_w, self.out_channels).transpose(0, 3, 1, 2)
+
+    def forward(self, x):
+        """Apply the convolution to real-valued (batch, channels, height, width) inputs."""
+        patches, shape = self._im2col(np.asarray(x, dtype=np.float32))
+        return self._reshape(self.dense.forward(patches), shape)
+
+    def forward_ternary(self, x_trits):
+        """Apply the convolution to ternary inputs using popcounts."""
+        patches, shape = self._im2col(np.asarray(x_trits, dtype=np.int8))
+        return self._reshape(self.dense.forward_ternary(patches), shape)
+
+
+def benchmark_dense(batch=256, in_features=1024, out_features=1024, repeat=5, seed=0):
+    """Time the ternary dense kernels against a float32 matmul of the same shape.
+
+    Returns the best time per call in seconds for each kernel, along with the
+    weight storage size of each representation.
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.standard_normal((out_features, in_features)).astype(np.float32)
+    x = rng.standard_normal((batch, in_features)).astype(np.float32)
+    x_trits = rng.integers(-1, 2, size=(batch, in_features), dtype=np.int8)
+    layer = TernaryDense.from_float(weights)
+
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+        return min(times)
+
+    return {
+        "float_matmul": best(lambda: x @ weights.T),
+        "ternary_masked": best(lambda: layer.forward(x)),
+        "ternary_popcount": best(lambda: layer.forward_ternary(x_trits)),
+        "float_weight_bytes": weights.nbytes,
+        "bitplane_weight_bytes": layer.positive.nbytes + layer.negative.nbytes,
+        "packed_trit_weight_bytes": layer.to_packed().nbytes,
+        "nonzero_fraction": layer.nonzero_fraction(),
+    }
+
+
+# Example usage of the ternary kernels
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    layer = TernaryDense(np.array([[1, 0, -1], [0, 1, 1]], dtype=np.int8))
+    print("Masked accumulation:", layer.forward([[0.5, 2.0, 1.5]]))
+    print("Popcount kernel:", layer.forward_ternary([[1, -1, 1]]))
+
+    conv = TernaryConv2d.from_float(rng.standard_normal((8, 3, 3, 3)), padding=1)
+    print("Conv output shape:", conv.forward(rng.standard_normal((2, 3, 16, 16))).shape)
+
+    for name, value in benchmark_dense().items():
+        print(f"{name}: {value:.6f}" if isinstance(value, float) else f"{name}: {value}")
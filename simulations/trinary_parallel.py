@@ -0,0 +1,177 @@
+"""
+Parallel Wide-Register Execution
+
+This module executes TrinaryCPU programs on int8 register arrays, splitting
+every element-wise instruction into cache-sized chunks that run on a thread
+pool. The NumPy kernels release the GIL, so one very wide instruction uses
+every core; all chunks of an instruction finish before the next instruction
+starts, preserving the sequential semantics of TrinaryCPU.execute.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from trinary_arrays import as_trit_array
+from trinary_simulator import TriWord
+
+# Trits per chunk: three int8 operands of this size fit comfortably in L2
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def _add(a, b, out):
+    """Trinary addition with wrap-around, matching Trit.__add__."""
+    np.add(a, b, out=out)
+    np.subtract(out, 3, out=out, where=out > 1)
+    np.add(out, 3, out=out, where=out < -1)
+
+
+def _abs(a, _, out):
+    """Element-wise absolute value; the second operand is unused."""
+    np.abs(a, out=out)
+
+
+KERNELS = {
+    "ADD": _add,
+    "MUL": lambda a, b, out: np.multiply(a, b, out=out),
+    "AND": lambda a, b, out: np.minimum(a, b, out=out),
+    "OR": lambda a, b, out: np.maximum(a, b, out=out),
+    "ABS": _abs,
+}
+
+
+class ParallelExecutor:
+    """Runs trinary programs on a TrinaryCPU with chunked, multithreaded kernels."""
+
+    def __init__(self, cpu, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Initialize the executor for cpu with a pool of worker threads."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.cpu = cpu
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+    def close(self):
+        """Shut down the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run_kernel(self, kernel, a, b, out):
+        """Apply a kernel chunk by chunk and wait for every chunk to finish."""
+        size = out.size
+        if self._pool is None or size <= self.chunk_size:
+            kernel(a, b, out)
+            return
+        futures = [
+            self._pool.submit(kernel, a[start:start + self.chunk_size],
+                              None if b is None else b[start:start + self.chunk_size],
+                              out[start:start + self.chunk_size])
+            for start in range(0, size, self.chunk_size)
+        ]
+        for future in futures:
+            future.result()  # Per-instruction barrier; re-raises worker errors
+
+    def execute(self, instructions, write_back=True, deadline=None):
+        """Execute instructions and return the final registers as int8 arrays.
+
+        With write_back the CPU's TriWord registers are updated as well, which
+        costs one Python object per trit; pass write_back=False to keep
+        results as arrays only. TimeoutError is raised if deadline (a
+        time.perf_counter() value) passes first, as in TrinaryCPU.execute.
+        """
+        cpu = self.cpu
+        instructions = cpu.resolve_branches(instructions)
+        registers = [np.array([trit.value for trit in reg], dtype=np.int8) for reg in cpu.registers]
+
+        while cpu.program_counter < len(instructions):
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise TimeoutError("Program did not finish before its deadline")
+            instruction = instructions[cpu.program_counter]
+            cpu.program_counter += 1
+            opcode = instruction["opcode"]
+
+            if opcode in KERNELS:
+                dest = registers[instruction["dest"]]
+                size = dest.size
+                if opcode == "ABS":
+                    a, b = registers[instruction["src"]], None
+                else:
+                    a, b = registers[instruction["src1"]], registers[instruction["src2"]]
+                if a.size < size or (b is not None and b.size < size):
+                    raise IndexError("Source register is shorter than the destination")
+                self._run_kernel(KERNELS[opcode], a[:size], None if b is None else b[:size], dest)
+
+            elif opcode == "LOAD":
+                # Values are range-checked before narrowing to int8, so e.g. int16 255 raises
+                # like the serial path instead of wrapping to -1; copy so later in-place
+                # kernels never write into the program's own data
+                registers[instruction["dest"]] = as_trit_array(instruction["value"]).reshape(-1).copy()
+
+            elif opcode == "HALT":
+                break
+
+            elif opcode == "SET_MODE":
+                cpu.set_computation_mode(instruction["mode"])
+
+            elif opcode == "JMP":
+                cpu.program_counter = instruction["target"]
+
+            elif opcode == "BR3":
+                value = registers[instruction["src"]][instruction.get("trit", 0)]
+                if value == -1:
+                    cpu.program_counter = instruction["neg"]
+                elif value == 0:
+                    cpu.program_counter = instruction["zero"]
+                else:
+                    cpu.program_counter = instruction["pos"]
+
+        if write_back:
+            cpu.registers = [TriWord(reg.tolist(), length=reg.size) for reg in registers]
+        return registers
+
+
+def execute_parallel(cpu, instructions, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, write_back=True,
+                     deadline=None):
+    """Execute instructions on cpu with a temporary ParallelExecutor."""
+    with ParallelExecutor(cpu, workers, chunk_size) as executor:
+        return executor.execute(instructions, write_back, deadline)
+
+
+# Example usage of parallel execution
+if __name__ == "__main__":
+    import time
+
+    from trinary_simulator import TrinaryCPU
+
+    size = 1_000_000
+    rng = np.random.default_rng(0)
+    program = [
+        {"opcode": "LOAD", "value": rng.integers(-1, 2, size=size).tolist(), "dest": 0},
+        {"opcode": "LOAD", "value": rng.integers(-1, 2, size=size).tolist(), "dest": 1},
+    ] + [
+        {"opcode": "ADD", "src1": 0, "src2": 1, "dest": 2},
+        {"opcode": "MUL", "src1": 2, "src2": 1, "dest": 3},
+        {"opcode": "OR", "src1": 3, "src2": 0, "dest": 0},
+    ] * 20
+
+    for workers in (1, os.cpu_count() or 1):
+        cpu = TrinaryCPU(register_count=4, register_size=size)
+        started = time.perf_counter()
+        result = execute_parallel(cpu, program, workers=workers, write_back=False)
+        print(f"{workers} worker(s): {time.perf_counter() - started:.3f}s")
+
+    try:
+        execute_parallel(TrinaryCPU(register_count=1, register_size=3),
+                         [{"opcode": "LOAD", "value": np.array([255, 0, 1], dtype=np.int16), "dest": 0}])
+    except ValueError as error:
+        print("Out-of-range LOAD rejected:", error)
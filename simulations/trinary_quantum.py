@@ -0,0 +1,174 @@
+"""
+Qutrit State-Vector Simulator
+
+This module simulates n qutrits with 3**n complex amplitudes, the quantum
+counterpart of the trinary registers in research/quantum_comparison.md. Basis
+level k of a qutrit corresponds to trit value k - 1, so measurement results
+come back as -1/0/1 trits like every other register in the simulator.
+
+Two backends share one interface:
+
+- dense: a NumPy array of all 3**n amplitudes, gates applied with tensordot;
+- sparse: sorted basis indices plus their non-zero amplitudes, for states
+  that are too large to store densely but touch few basis states.
+
+QutritState picks the backend from the state size unless one is requested.
+"""
+
+import numpy as np
+
+OMEGA = np.exp(2j * np.pi / 3)
+
+# Standard qutrit gates (levels 0, 1, 2 <-> trits -1, 0, 1)
+X = np.roll(np.eye(3), 1, axis=0)                       # |k> -> |k+1 mod 3>
+Z = np.diag([1, OMEGA, OMEGA ** 2])
+H = np.array([[OMEGA ** (j * k) for k in range(3)] for j in range(3)]) / np.sqrt(3)
+I3 = np.eye(3)
+CSUM = np.zeros((9, 9))                                 # |a, b> -> |a, a + b mod 3>
+for _a in range(3):
+    for _b in range(3):
+        CSUM[_a * 3 + (_a + _b) % 3, _a * 3 + _b] = 1
+
+# Largest dense state vector chosen automatically (bytes of complex128 amplitudes)
+DENSE_LIMIT_BYTES = 1 << 28
+MAX_QUTRITS = 39  # 3**39 basis indices still fit in int64
+
+
+def _digits(indices, count):
+    """Return the base-3 digits (most significant first) of basis indices."""
+    indices = np.asarray(indices, dtype=np.int64)
+    digits = np.empty(indices.shape + (count,), dtype=np.int8)
+    for position in range(count - 1, -1, -1):
+        digits[..., position] = indices % 3
+        indices = indices // 3
+    return digits
+
+
+class QutritState:
+    """An n-qutrit pure state with a dense or sparse amplitude backend."""
+
+    def __init__(self, count, backend="auto", levels=None):
+        """Initialize count qutrits in a basis state (default all level 0).
+
+        backend is "dense", "sparse" or "auto" (dense while the amplitude
+        vector fits in DENSE_LIMIT_BYTES).
+        """
+        if count < 1 or count > MAX_QUTRITS:
+            raise ValueError(f"Qutrit count must be between 1 and {MAX_QUTRITS}")
+        if backend == "auto":
+            backend = "dense" if 16 * 3 ** count <= DENSE_LIMIT_BYTES else "sparse"
+        if backend not in ("dense", "sparse"):
+            raise ValueError("Backend must be dense, sparse or auto")
+        self.count = count
+        self.backend = backend
+        levels = [0] * count if levels is None else list(levels)
+        if len(levels) != count or any(level not in (0, 1, 2) for level in levels):
+            raise ValueError("Levels must be one of 0, 1, 2 per qutrit")
+        index = 0
+        for level in levels:
+            index = index * 3 + level
+        if backend == "dense":
+            self.amplitudes = np.zeros(3 ** count, dtype=np.complex128)
+            self.amplitudes[index] = 1
+        else:
+            self.indices = np.array([index], dtype=np.int64)
+            self.amplitudes = np.array([1], dtype=np.complex128)
+
+    @classmethod
+    def from_trits(cls, trits, backend="auto"):
+        """Create the basis state whose qutrits hold the given -1/0/1 values."""
+        return cls(len(trits), backend, [int(trit) + 1 for trit in trits])
+
+    def nonzero_count(self):
+        """Return the number of basis states with non-zero amplitude."""
+        if self.backend == "dense":
+            return int(np.count_nonzero(self.amplitudes))
+        return self.indices.size
+
+    def apply(self, gate, *qutrits):
+        """Apply a 3x3 gate to one qutrit or a 9x9 gate to two qutrits."""
+        gate = np.asarray(gate, dtype=np.complex128)
+        if len(qutrits) not in (1, 2) or gate.shape != (3 ** len(qutrits),) * 2:
+            raise ValueError("Use a 3x3 gate on one qutrit or a 9x9 gate on two qutrits")
+        if len(set(qutrits)) != len(qutrits) or any(not 0 <= q < self.count for q in qutrits):
+            raise ValueError("Invalid qutrit index")
+        if self.backend == "dense":
+            self._apply_dense(gate, qutrits)
+        else:
+            self._apply_sparse(gate, qutrits)
+        return self
+
+    def _apply_dense(self, gate, qutrits):
+        """Contract the gate with the state tensor along the target axes."""
+        k = len(qutrits)
+        state = self.amplitudes.reshape((3,) * self.count)
+        tensor = gate.reshape((3,) * (2 * k))
+        state = np.tensordot(tensor, state, axes=(list(range(k, 2 * k)), list(qutrits)))
+        # tensordot puts the gate's output axes first; move them back into place
+        self.amplitudes = np.moveaxis(state, list(range(k)), list(qutrits)).reshape(-1)
+
+    def _apply_sparse(self, gate, qutrits):
+        """Expand every stored basis state into its images under the gate and merge."""
+        k = len(qutrits)
+        places = np.array([3 ** (self.count - 1 - q) for q in qutrits], dtype=np.int64)
+        digits = (self.indices[:, None] // places) % 3                    # (nnz, k)
+        column = digits @ (3 ** np.arange(k - 1, -1, -1))                 # gate input index
+        base = self.indices - digits @ places
+
+        outputs = np.arange(3 ** k)
+        out_digits = _digits(outputs, k).astype(np.int64)                 # (3**k, k)
+        new_indices = (base[:, None] + out_digits @ places).reshape(-1)
+        new_amplitudes = (gate[:, column].T * self.amplitudes[:, None]).reshape(-1)
+
+        keep = new_amplitudes != 0
+        unique, inverse = np.unique(new_indices[keep], return_inverse=True)
+        merged = np.zeros(unique.size, dtype=np.complex128)
+        np.add.at(merged, inverse, new_amplitudes[keep])
+        nonzero = np.abs(merged) > 1e-15
+        self.indices = unique[nonzero]
+        self.amplitudes = merged[nonzero]
+
+    def probabilities(self):
+        """Return (basis indices, probabilities) of the non-zero amplitudes."""
+        if self.backend == "dense":
+            indices = np.flatnonzero(self.amplitudes)
+            amplitudes = self.amplitudes[indices]
+        else:
+            indices, amplitudes = self.indices, self.amplitudes
+        probabilities = np.abs(amplitudes) ** 2
+        return indices, probabilities / probabilities.sum()
+
+    def sample(self, shots=1, rng=None):
+        """Sample measurement outcomes without collapsing the state.
+
+        Returns a (shots, count) int8 array of -1/0/1 trits.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        indices, probabilities = self.probabilities()
+        outcomes = rng.choice(indices, size=shots, p=probabilities)
+        return _digits(outcomes, self.count) - 1
+
+    def measure(self, rng=None):
+        """Measure every qutrit, collapse the state and return the outcome trits."""
+        outcome = self.sample(1, rng)[0]
+        levels = (outcome + 1).tolist()
+        collapsed = QutritState(self.count, self.backend, levels)
+        self.amplitudes = collapsed.amplitudes
+        if self.backend == "sparse":
+            self.indices = collapsed.indices
+        return outcome
+
+
+# Example usage of the qutrit simulator
+if __name__ == "__main__":
+    # Qutrit GHZ state: (|-1,-1,...> + |0,0,...> + |1,1,...>) / sqrt(3)
+    for count, backend in ((6, "dense"), (30, "sparse")):
+        state = QutritState(count, backend)
+        state.apply(H, 0)
+        for target in range(1, count):
+            state.apply(CSUM, 0, target)
+        shots = state.sample(10_000, np.random.default_rng(0))
+        correlated = bool((shots == shots[:, :1]).all())
+        values, counts = np.unique(shots[:, 0], return_counts=True)
+        print(f"{count} qutrits ({state.backend}, {state.nonzero_count()} non-zero amplitudes): "
+              f"all qutrits agree={correlated}, outcome counts={dict(zip(values.tolist(), counts.tolist()))}")
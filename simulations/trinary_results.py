@@ -0,0 +1,244 @@
+"""
+Columnar Batch Results
+
+This module stores the final registers of many TrinaryCPU runs column by
+column: for each register, one file of fixed-width packed trits per run
+(trinary_codec's 5 trits per byte) and one file of precomputed int64 decimal
+values. Columns are memory-mapped by the reader, so slicing a range of runs
+touches only those rows and analysis of very large sweeps does not need the
+whole result set in RAM.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from trinary_arrays import MAX_DECIMAL_TRITS, as_trit_array, pack_triwords, to_decimal
+from trinary_codec import BYTE_PACKING, decode, encode, packed_size
+
+META_FILE = "meta.json"
+
+
+def _row_bytes(register_size):
+    """Return the packed size of one register value."""
+    return packed_size(register_size, BYTE_PACKING)
+
+
+def _column_paths(directory, register):
+    """Return the packed-trit and decimal column files of a register."""
+    base = os.path.join(directory, f"reg{register}")
+    return base + ".trits", base + ".decimal"
+
+
+class ResultWriter:
+    """Appends run results to a directory of per-register column files."""
+
+    def __init__(self, directory, register_count, register_size, buffer_runs=4096):
+        """Create (or extend) a result set with the given register geometry."""
+        self.directory = directory
+        self.register_count = register_count
+        self.register_size = register_size
+        self.buffer_runs = buffer_runs
+        self.with_decimal = register_size <= MAX_DECIMAL_TRITS
+        self._buffer = []
+        os.makedirs(directory, exist_ok=True)
+
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if (meta["register_count"], meta["register_size"]) != (register_count, register_size):
+                raise ValueError("Existing result set has a different register geometry")
+            self.rows = meta["rows"]
+            self._truncate()
+        else:
+            self.rows = 0
+            self._write_meta()
+
+    def _write_meta(self):
+        """Atomically record the schema and row count."""
+        meta = {
+            "register_count": self.register_count,
+            "register_size": self.register_size,
+            "packing": BYTE_PACKING,
+            "row_bytes": _row_bytes(self.register_size),
+            "decimal": self.with_decimal,
+            "rows": self.rows,
+        }
+        tmp = os.path.join(self.directory, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.directory, META_FILE))
+
+    def _truncate(self):
+        """Cut every column back to the committed row count.
+
+        meta.json is only updated after all columns are written, so rows past
+        its count are left over from an interrupted write and are dropped.
+        """
+        for register in range(self.register_count):
+            trits_path, decimal_path = _column_paths(self.directory, register)
+            columns = [(trits_path, _row_bytes(self.register_size))]
+            if self.with_decimal:
+                columns.append((decimal_path, 8))
+            for path, row_bytes in columns:
+                size = self.rows * row_bytes
+                if os.path.exists(path) and os.path.getsize(path) > size:
+                    os.truncate(path, size)
+                elif size and (not os.path.exists(path) or os.path.getsize(path) < size):
+                    raise ValueError(f"Column file {path} is shorter than the recorded row count")
+
+    def append(self, registers):
+        """Buffer one run given as a list of TriWords (e.g. cpu.registers)."""
+        if len(registers) != self.register_count:
+            raise ValueError(f"Expected {self.register_count} registers")
+        if any(len(register) != self.register_size for register in registers):
+            raise ValueError(f"Registers must hold {self.register_size} trits")
+        self._buffer.append(pack_triwords(registers))
+        if len(self._buffer) >= self.buffer_runs:
+            self.flush()
+
+    def append_cpu(self, cpu):
+        """Buffer the final registers of a TrinaryCPU run."""
+        self.append(cpu.registers)
+
+    def append_batch(self, trits):
+        """Write many runs at once from a (runs, register_count, register_size) trit array."""
+        self.flush()
+        trits = as_trit_array(trits)
+        if trits.ndim != 3 or trits.shape[1:] != (self.register_count, self.register_size):
+            raise ValueError("Batch must have shape (runs, register_count, register_size)")
+        self._write(trits)
+
+    def flush(self):
+        """Write buffered runs to the column files."""
+        if self._buffer:
+            batch = np.stack(self._buffer)
+            self._buffer = []
+            self._write(batch)
+
+    def _write(self, batch):
+        """Append a (runs, register_count, register_size) batch to every column.
+
+        Every column is encoded before any is written, so a bad batch leaves
+        the files untouched. A failed write is rolled back, and rows left by a
+        crash part-way through are past the meta.json count and truncated on
+        the next open.
+        """
+        runs = batch.shape[0]
+        padded = _row_bytes(self.register_size) * BYTE_PACKING
+        encoded = []
+        for register in range(self.register_count):
+            column = np.zeros((runs, padded), dtype=np.int8)
+            column[:, :self.register_size] = batch[:, register, :]
+            decimal = to_decimal(batch[:, register, :]).astype("<i8") if self.with_decimal else None
+            encoded.append((encode(column), decimal))
+        try:
+            for register, (packed, decimal) in enumerate(encoded):
+                trits_path, decimal_path = _column_paths(self.directory, register)
+                with open(trits_path, "ab") as f:
+                    f.write(packed.tobytes())
+                if decimal is not None:
+                    with open(decimal_path, "ab") as f:
+                        f.write(decimal.tobytes())
+        except BaseException:
+            self._truncate()  # Keep the columns aligned for later appends
+            raise
+        self.rows += runs
+        self._write_meta()
+
+    def close(self):
+        """Flush any buffered runs."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ResultReader:
+    """Memory-mapped access to a result set written by ResultWriter."""
+
+    def __init__(self, directory):
+        """Open the result set in directory."""
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.register_count = meta["register_count"]
+        self.register_size = meta["register_size"]
+        self.rows = meta["rows"]
+        self.row_bytes = meta["row_bytes"]
+        self.has_decimal = meta["decimal"]
+        self._packed = {}
+        self._decimal = {}
+
+    def __len__(self):
+        """Return the number of runs."""
+        return self.rows
+
+    def _map(self, register, decimal):
+        """Memory-map one column (lazily, on first use)."""
+        if not 0 <= register < self.register_count:
+            raise IndexError("Register index out of range")
+        cache = self._decimal if decimal else self._packed
+        if register not in cache:
+            trits_path, decimal_path = _column_paths(self.directory, register)
+            if decimal:
+                if not self.has_decimal:
+                    raise ValueError(f"No decimal column for registers wider than {MAX_DECIMAL_TRITS} trits")
+                cache[register] = np.memmap(decimal_path, dtype="<i8", mode="r", shape=(self.rows,))
+            else:
+                cache[register] = np.memmap(trits_path, dtype=np.uint8, mode="r",
+                                            shape=(self.rows, self.row_bytes))
+        return cache[register]
+
+    def decimal(self, register, start=0, stop=None):
+        """Return the decimal values of one register for a range of runs."""
+        if self.rows == 0:
+            return np.zeros(0, dtype=np.int64)
+        return self._map(register, decimal=True)[start:stop]
+
+    def trits(self, register, start=0, stop=None):
+        """Decode one register for a range of runs into a (runs, register_size) array."""
+        if self.rows == 0:
+            return np.zeros((0, self.register_size), dtype=np.int8)
+        rows = self._map(register, decimal=False)[start:stop]
+        decoded = decode(np.ascontiguousarray(rows), rows.size * BYTE_PACKING, BYTE_PACKING)
+        return decoded.reshape(len(rows), self.row_bytes * BYTE_PACKING)[:, :self.register_size]
+
+    def run(self, index):
+        """Return every register of one run as a (register_count, register_size) array."""
+        return np.stack([self.trits(register, index, index + 1)[0] for register in range(self.register_count)])
+
+
+# Example usage of columnar results
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from trinary_simulator import TrinaryCPU
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        with ResultWriter(tmp, register_count=4, register_size=4) as writer:
+            for _ in range(1000):
+                cpu = TrinaryCPU(register_count=4, register_size=4)
+                a, b = rng.integers(-1, 2, size=(2, 4)).tolist()
+                cpu.execute([
+                    {"opcode": "LOAD", "value": a, "dest": 0},
+                    {"opcode": "LOAD", "value": b, "dest": 1},
+                    {"opcode": "ADD", "src1": 0, "src2": 1, "dest": 2},
+                    {"opcode": "MUL", "src1": 0, "src2": 1, "dest": 3},
+                ])
+                writer.append_cpu(cpu)
+            writer.append_batch(rng.integers(-1, 2, size=(1_000_000, 4, 4), dtype=np.int8))
+
+        reader = ResultReader(tmp)
+        started = time.perf_counter()
+        mean = reader.decimal(2).mean()
+        print(f"{len(reader)} runs, mean of register 2 = {mean:.3f} ({time.perf_counter() - started:.3f}s)")
+        print("Run 0 registers:", reader.run(0).tolist())
+        print("Register 3 of runs 10-12:", reader.trits(3, 10, 13).tolist())
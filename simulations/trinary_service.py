@@ -0,0 +1,406 @@
+"""
+Trinary Job Server
+
+This module provides an asyncio-based local job server that runs trinary
+programs on a pool of reusable TrinaryCPU instances, with backpressure,
+per-job timeouts and latency histograms. Queued jobs are spread over every
+idle CPU; jobs whose programs differ only in their LOAD values are batched
+into one vectorized run over int8 arrays.
+"""
+
+import asyncio
+import bisect
+import time
+
+import numpy as np
+
+from trinary_arrays import as_trit_array
+from trinary_parallel import KERNELS
+from trinary_simulator import TrinaryCPU, TrifactoryEngine, TriWord
+
+
+class LatencyHistogram:
+    """A fixed-bucket histogram of latencies measured in seconds."""
+
+    DEFAULT_BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                      0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, bounds=None):
+        """Initialize the histogram with ascending bucket upper bounds."""
+        self.bounds = tuple(bounds) if bounds else self.DEFAULT_BOUNDS
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket is overflow
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Record a single latency sample."""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p):
+        """Return the bucket upper bound that contains the p-th percentile."""
+        if self.total == 0:
+            return 0.0
+        rank = p / 100.0 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        """Return a summary of the recorded latencies."""
+        return {
+            "count": self.total,
+            "mean": self.sum / self.total if self.total else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": list(zip(self.bounds + (float("inf"),), self.counts)),
+        }
+
+
+class CPUPool:
+    """A fixed pool of reusable TrinaryCPU and TrifactoryEngine pairs."""
+
+    def __init__(self, size=4, register_count=8, register_size=8):
+        """Initialize the pool with pre-built CPUs."""
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self._idle = asyncio.Queue()
+        for _ in range(size):
+            cpu = TrinaryCPU(register_count=register_count, register_size=register_size)
+            self._idle.put_nowait(TrifactoryEngine(cpu))
+
+    async def acquire(self):
+        """Wait for an idle engine and take it out of the pool."""
+        return await self._idle.get()
+
+    def release(self, engine):
+        """Reset an engine's CPU and return it to the pool."""
+        engine.cpu.reset()
+        engine.mode = "ADAPTIVE"
+        self._idle.put_nowait(engine)
+
+    def idle_count(self):
+        """Return the number of engines currently available."""
+        return self._idle.qsize()
+
+
+class _Job:
+    """A queued program together with its result future and deadline."""
+
+    __slots__ = ("program", "task_type", "future", "submitted", "deadline")
+
+    def __init__(self, program, task_type, future, submitted, deadline):
+        self.program = program
+        self.task_type = task_type
+        self.future = future
+        self.submitted = submitted
+        self.deadline = deadline
+
+
+# Opcodes without data-dependent control flow, so one instruction stream serves a whole batch
+VECTOR_OPCODES = {"ADD", "MUL", "AND", "OR", "ABS", "LOAD", "HALT", "SET_MODE", "LABEL"}
+
+
+def _batch_key(program, task_type, register_size):
+    """Return a key shared by programs that differ only in their LOAD values.
+
+    Returns None for programs that cannot join a vectorized batch: programs
+    with branches, or LOADs that change a register's width.
+    """
+    key = [task_type]
+    try:
+        for instruction in program:
+            if instruction["opcode"] not in VECTOR_OPCODES:
+                return None
+            if instruction["opcode"] == "LOAD":
+                if len(instruction["value"]) != register_size:
+                    return None
+                instruction = dict(instruction, value=None)
+            key.append(tuple(sorted(instruction.items())))
+        key = tuple(key)
+        hash(key)
+    except (KeyError, TypeError):
+        return None
+    return key
+
+
+def _run_serial(engine, jobs):
+    """Run jobs back to back on one engine and snapshot the registers."""
+    results = []
+    for job in jobs:
+        cpu = engine.cpu
+        cpu.reset()
+        if job.task_type is not None:
+            engine.optimize_for_task(job.task_type)
+        started = time.perf_counter()
+        try:
+            # The deadline stops runaway programs (e.g. a JMP loop) so the engine returns to the pool
+            cpu.execute(job.program, deadline=job.deadline)
+            registers = [TriWord([trit.value for trit in reg]) for reg in cpu.registers]
+            results.append((registers, None, time.perf_counter() - started))
+        except Exception as exc:  # Reported back to the submitting caller
+            results.append((None, exc, time.perf_counter() - started))
+    return results
+
+
+def _run_vectorized(engine, jobs):
+    """Run same-shape jobs as one program over (register, job, trit) int8 arrays."""
+    cpu = engine.cpu
+    cpu.reset()
+    if jobs[0].task_type is not None:
+        engine.optimize_for_task(jobs[0].task_type)
+    started = time.perf_counter()
+    deadlines = [job.deadline for job in jobs if job.deadline is not None]
+    deadline = min(deadlines) if deadlines else None
+    registers = np.zeros((cpu.register_count, len(jobs), cpu.register_size), dtype=np.int8)
+    for index, instruction in enumerate(jobs[0].program):
+        if deadline is not None and time.perf_counter() >= deadline:
+            raise TimeoutError("Batch did not finish before its earliest deadline")
+        opcode = instruction["opcode"]
+        if opcode == "LOAD":
+            registers[instruction["dest"]] = as_trit_array([job.program[index]["value"] for job in jobs])
+        elif opcode == "HALT":
+            break
+        elif opcode == "SET_MODE":
+            cpu.set_computation_mode(instruction["mode"])
+        elif opcode == "ABS":
+            KERNELS[opcode](registers[instruction["src"]], None, registers[instruction["dest"]])
+        elif opcode in KERNELS:
+            KERNELS[opcode](registers[instruction["src1"]], registers[instruction["src2"]],
+                            registers[instruction["dest"]])
+    elapsed = time.perf_counter() - started
+    return [([TriWord(row.tolist()) for row in registers[:, job]], None, elapsed)
+            for job in range(len(jobs))]
+
+
+def _run_batch(engine, jobs, vectorized):
+    """Run a batch of jobs on one engine, vectorized when they share a shape.
+
+    If the vectorized run fails (a bad LOAD value, a register index or the
+    earliest deadline passing), the batch is rerun serially so each job gets
+    its own result or error. Every run stops at its job's deadline, so a
+    timed-out job never holds an engine past that point.
+    """
+    if vectorized and len(jobs) > 1:
+        try:
+            return _run_vectorized(engine, jobs)
+        except Exception:
+            pass
+    return _run_serial(engine, jobs)
+
+
+class TrinaryJobServer:
+    """Serves trinary programs from a pool of reusable CPUs."""
+
+    def __init__(self, pool_size=4, register_count=8, register_size=8,
+                 max_queue=64, max_batch=64, job_timeout=None):
+        """Initialize the server configuration; call start() to begin serving."""
+        if max_queue < 1 or max_batch < 1:
+            raise ValueError("max_queue and max_batch must be at least 1")
+        self.pool_size = pool_size
+        self.register_count = register_count
+        self.register_size = register_size
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.job_timeout = job_timeout
+        self.pool = None
+        self.queue_latency = LatencyHistogram()
+        self.execution_latency = LatencyHistogram()
+        self.total_latency = LatencyHistogram()
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self._queue = None
+        self._dispatcher = None
+
+    async def start(self):
+        """Build the CPU pool and start dispatching queued jobs."""
+        if self._dispatcher:
+            return
+        self.pool = CPUPool(self.pool_size, self.register_count, self.register_size)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self):
+        """Finish queued jobs and stop dispatching."""
+        if not self._dispatcher:
+            return
+        await self._queue.join()
+        self._dispatcher.cancel()
+        await asyncio.gather(self._dispatcher, return_exceptions=True)
+        self._dispatcher = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def _make_job(self, program, task_type, timeout):
+        """Create a job record with its absolute deadline."""
+        if not self._dispatcher:
+            raise RuntimeError("Server is not running")
+        timeout = self.job_timeout if timeout is None else timeout
+        now = time.perf_counter()
+        deadline = now + timeout if timeout is not None else None
+        future = asyncio.get_running_loop().create_future()
+        return _Job(program, task_type, future, now, deadline)
+
+    async def submit(self, program, task_type=None, timeout=None):
+        """Run a program and return its final registers.
+
+        Waits for queue space when the server is saturated (backpressure) and
+        raises TimeoutError when the job does not finish within its timeout.
+        """
+        job = self._make_job(program, task_type, timeout)
+        await self._queue.put(job)
+        return await self._await_result(job)
+
+    async def try_submit(self, program, task_type=None, timeout=None):
+        """Like submit(), but raise RuntimeError at once if the queue is full."""
+        job = self._make_job(program, task_type, timeout)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise RuntimeError("Job queue is full")
+        return await self._await_result(job)
+
+    async def _await_result(self, job):
+        """Wait for a job's result, enforcing its deadline."""
+        if job.deadline is None:
+            return await job.future
+        remaining = max(job.deadline - time.perf_counter(), 0.0)
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.future), remaining)
+        except (asyncio.TimeoutError, TimeoutError):
+            self.timed_out += 1
+            job.future.cancel()  # Workers skip cancelled jobs that are still queued
+            raise
+
+    def _take_batches(self, first):
+        """Group first and up to max_batch - 1 further queued jobs into batches.
+
+        Jobs sharing a _batch_key form one vectorized batch; every other job
+        is a batch of its own so it can run on any idle CPU.
+        """
+        groups = {}
+        batches = []
+        job = first
+        while True:
+            key = _batch_key(job.program, job.task_type, self.register_size)
+            if key is None:
+                batches.append(([job], False))
+            elif key in groups:
+                groups[key].append(job)
+            else:
+                groups[key] = [job]
+                batches.append((groups[key], True))
+            if sum(len(jobs) for jobs, _ in batches) >= self.max_batch:
+                break
+            try:
+                job = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        return batches
+
+    async def _dispatch(self):
+        """Hand queued batches to idle pooled CPUs as soon as both are available."""
+        running = set()
+        try:
+            while True:
+                engine = await self.pool.acquire()
+                batches = self._take_batches(await self._queue.get())
+                for index, (jobs, vectorized) in enumerate(batches):
+                    if index:
+                        engine = await self.pool.acquire()
+                    task = asyncio.create_task(self._run(engine, jobs, vectorized))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _run(self, engine, batch, vectorized):
+        """Execute one batch on a pooled engine and resolve its jobs' futures."""
+        try:
+            now = time.perf_counter()
+            live = []
+            for job in batch:
+                if job.future.done():
+                    continue
+                if job.deadline is not None and now >= job.deadline:
+                    job.future.cancel()
+                    continue
+                self.queue_latency.record(now - job.submitted)
+                live.append(job)
+            if not live:
+                return
+
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(None, _run_batch, engine, live, vectorized)
+
+            finished = time.perf_counter()
+            for job, (registers, error, elapsed) in zip(live, results):
+                self.execution_latency.record(elapsed)
+                if job.future.done():
+                    continue
+                if error is not None:
+                    if not isinstance(error, TimeoutError):  # Timeouts are counted by _await_result
+                        self.failed += 1
+                    job.future.set_exception(error)
+                else:
+                    self.completed += 1
+                    self.total_latency.record(finished - job.submitted)
+                    job.future.set_result(registers)
+        finally:
+            self.pool.release(engine)
+            for _ in batch:
+                self._queue.task_done()
+
+    def stats(self):
+        """Return counters and latency histograms for the server."""
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "idle_cpus": self.pool.idle_count() if self.pool else 0,
+            "queue_latency": self.queue_latency.snapshot(),
+            "execution_latency": self.execution_latency.snapshot(),
+            "total_latency": self.total_latency.snapshot(),
+        }
+
+
+# Example usage of the job server
+if __name__ == "__main__":
+    program = [
+        {"opcode": "LOAD", "value": [1, 0, -1, 1], "dest": 0},
+        {"opcode": "LOAD", "value": [0, 1, -1, 0], "dest": 1},
+        {"opcode": "ADD", "src1": 0, "src2": 1, "dest": 2},
+        {"opcode": "MUL", "src1": 0, "src2": 1, "dest": 3},
+        {"opcode": "HALT"}
+    ]
+
+    async def main():
+        async with TrinaryJobServer(pool_size=4, register_size=4, job_timeout=5.0) as server:
+            results = await asyncio.gather(*[server.submit(program) for _ in range(200)])
+            print("Register 2 (Addition Result):", results[0][2])
+            stats = server.stats()
+            print("Completed jobs:", stats["completed"])
+            print("Total latency p50/p99 (s):",
+                  stats["total_latency"]["p50"], stats["total_latency"]["p99"])
+
+    asyncio.run(main())
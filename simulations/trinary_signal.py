@@ -0,0 +1,166 @@
+"""
+Streaming Signal Flattening
+
+This module applies the signal flattening of examples/signal_flattening_demo.md
+(-1 and 1 become 1, 0 stays 0, as in Trit.as_binary) to large trinary sample
+buffers in fixed-size chunks. Each chunk produces two packed bit planes:
+
+- the flattened plane, one bit per sample, ready for binary consumers;
+- a sign plane marking the samples that were -1.
+
+Together the planes reverse the flattening losslessly. Inputs may be arrays,
+memory-mapped files or any iterable of chunks, so captures far larger than
+RAM stream through with memory bounded by the chunk size.
+"""
+
+import os
+
+import numpy as np
+
+from trinary_arrays import as_trit_array
+
+# Samples per chunk; a multiple of 8 so every chunk packs into whole bytes
+DEFAULT_CHUNK = 1 << 22
+
+
+def flatten(trits):
+    """Return the packed (flattened, sign) bit planes of a trit array.
+
+    Raises ValueError for samples other than -1, 0 and 1, which the planes
+    could not reproduce.
+    """
+    trits = as_trit_array(trits).reshape(-1)
+    return np.packbits(trits != 0), np.packbits(trits < 0)
+
+
+def unflatten(flat, sign, count):
+    """Rebuild count trits from packed flattened and sign planes."""
+    magnitude = np.unpackbits(np.asarray(flat, dtype=np.uint8), count=count).view(np.int8)
+    negative = np.unpackbits(np.asarray(sign, dtype=np.uint8), count=count).view(np.int8)
+    return magnitude - 2 * negative
+
+
+def _chunks(source, chunk):
+    """Yield flat chunks from an array, memmap or iterable of chunks.
+
+    Array slices keep their dtype and are range-checked by flatten();
+    iterable chunks are range-checked here before narrowing to int8.
+    """
+    if isinstance(source, np.ndarray):
+        source = source.reshape(-1)
+        for start in range(0, source.size, chunk):
+            yield source[start:start + chunk]
+    else:
+        for block in source:
+            yield as_trit_array(block).reshape(-1)
+
+
+def flatten_stream(source, chunk=DEFAULT_CHUNK):
+    """Yield (flattened, sign) packed planes for each chunk of samples.
+
+    All chunks except the last must hold a multiple of 8 samples so the packed
+    planes can be concatenated; ValueError is raised otherwise.
+    """
+    if chunk % 8:
+        raise ValueError("Chunk size must be a multiple of 8 samples")
+    pending = None
+    for block in _chunks(source, chunk):
+        if pending is not None:
+            if pending.size % 8:
+                raise ValueError("Only the last chunk may hold a number of samples that is not a multiple of 8")
+            yield flatten(pending)
+        pending = block
+    if pending is not None:
+        yield flatten(pending)
+
+
+def unflatten_stream(planes, count):
+    """Yield trit chunks from an iterable of (flattened, sign) plane pairs.
+
+    count is the total number of samples, which trims the final chunk's padding.
+    """
+    remaining = count
+    for flat, sign in planes:
+        samples = min(len(flat) * 8, remaining)
+        yield unflatten(flat, sign, samples)
+        remaining -= samples
+        if remaining <= 0:
+            break
+
+
+def flatten_file(source_path, flat_path, sign_path=None, chunk=DEFAULT_CHUNK):
+    """Flatten a raw int8 sample file, writing the flattened and sign planes.
+
+    Without sign_path only the flattened plane is written (lossy, binary
+    compatible). Returns the number of samples processed.
+    """
+    count = os.path.getsize(source_path)
+    if count == 0:
+        open(flat_path, "wb").close()
+        if sign_path:
+            open(sign_path, "wb").close()
+        return 0
+    samples = np.memmap(source_path, dtype=np.int8, mode="r")
+    sign_file = open(sign_path, "wb") if sign_path else None
+    try:
+        with open(flat_path, "wb") as flat_file:
+            for flat, sign in flatten_stream(samples, chunk):
+                flat_file.write(flat.tobytes())
+                if sign_file is not None:
+                    sign_file.write(sign.tobytes())
+    finally:
+        if sign_file is not None:
+            sign_file.close()
+    return count
+
+
+def unflatten_file(flat_path, sign_path, output_path, count, chunk=DEFAULT_CHUNK):
+    """Rebuild a raw int8 sample file from its flattened and sign planes."""
+    if count == 0:
+        open(output_path, "wb").close()
+        return 0
+    flat = np.memmap(flat_path, dtype=np.uint8, mode="r")
+    sign = np.memmap(sign_path, dtype=np.uint8, mode="r")
+    if flat.size != sign.size or flat.size * 8 < count:
+        raise ValueError("Plane files do not match the sample count")
+    step = chunk // 8
+    planes = ((flat[start:start + step], sign[start:start + step]) for start in range(0, flat.size, step))
+    with open(output_path, "wb") as output:
+        for block in unflatten_stream(planes, count):
+            output.write(block.tobytes())
+    return count
+
+
+# Example usage of streaming signal flattening
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        capture = os.path.join(tmp, "capture.trits")
+        rng.integers(-1, 2, size=50_000_003, dtype=np.int8).tofile(capture)
+        flat_path = os.path.join(tmp, "capture.flat")
+        sign_path = os.path.join(tmp, "capture.sign")
+        restored = os.path.join(tmp, "restored.trits")
+
+        started = time.perf_counter()
+        count = flatten_file(capture, flat_path, sign_path)
+        elapsed = time.perf_counter() - started
+        print(f"Flattened {count} samples at {count / elapsed / 1e6:.0f} MB/s")
+
+        started = time.perf_counter()
+        unflatten_file(flat_path, sign_path, restored, count)
+        elapsed = time.perf_counter() - started
+        print(f"Unflattened at {count / elapsed / 1e6:.0f} MB/s")
+
+        original = np.memmap(capture, dtype=np.int8, mode="r")
+        print("Lossless round trip:", bool(np.array_equal(original, np.memmap(restored, dtype=np.int8, mode="r"))))
+
+    # Out-of-range samples raise instead of wrapping when narrowed to int8
+    wide = np.array([255, 0, 1], dtype=np.int16)
+    for source in (lambda: flatten(wide), lambda: list(flatten_stream([wide]))):
+        try:
+            source()
+        except ValueError as error:
+            print("Out-of-range samples rejected:", error)
@@ -5,6 +5,8 @@ This module provides a simulation environment for three-dimensional computing
 using the states -1, 0, and 1.
 """
 
+import time
+
 class Trit:
     """A single trinary digit with value -1, 0, or 1"""
     
@@ -115,6 +117,10 @@ class TriWord:
         else:
             self._trits[index] = Trit(value)
     
+    def __iter__(self):
+        """Iterate over the trits of the triword."""
+        return iter(self._trits)
+    
     def __len__(self):
         """Return the length of the triword."""
         return len(self._trits)
@@ -140,6 +146,11 @@ class TriWord:
     def to_binary_array(self):
         """Convert to binary representation array."""
         return [trit.as_binary() for trit in self._trits]
+    
+    def lazy(self):
+        """Return a lazy expression over this triword (see trinary_lazy)."""
+        from trinary_lazy import lazy
+        return lazy(self)
 
 
 class TrinaryCPU:
@@ -147,19 +158,80 @@ class TrinaryCPU:
     
     def __init__(self, register_count=8, register_size=8):
         """Initialize the CPU with registers."""
+        self.register_count = register_count
+        self.register_size = register_size
         self.registers = [TriWord([0] * register_size) for _ in range(register_count)]
         self.program_counter = 0
         self.computation_mode = "FULL_TRINARY"  # Can be "FULL_TRINARY" or "ABSOLUTE_VALUE"
         
+    def reset(self):
+        """Clear all registers and return the CPU to its power-on state."""
+        self.registers = [TriWord([0] * self.register_size) for _ in range(self.register_count)]
+        self.program_counter = 0
+        self.computation_mode = "FULL_TRINARY"
+        
     def set_computation_mode(self, mode):
         """Set the computation mode."""
         if mode not in ["FULL_TRINARY", "ABSOLUTE_VALUE"]:
             raise ValueError("Mode must be FULL_TRINARY or ABSOLUTE_VALUE")
         self.computation_mode = mode
     
-    def execute(self, instructions):
-        """Execute a sequence of trinary instructions."""
+    def resolve_branches(self, instructions):
+        """Resolve JMP/BR3 targets to instruction indices and validate them.
+        
+        Targets may be a LABEL name or an instruction index. A BR3 without a
+        target for some trit value falls through to the next instruction.
+        """
+        labels = {}
+        for index, instruction in enumerate(instructions):
+            if instruction["opcode"] == "LABEL":
+                name = instruction["name"]
+                if name in labels:
+                    raise ValueError(f"Duplicate label: {name}")
+                labels[name] = index
+        
+        def resolve(target, index):
+            if target is None:
+                return index + 1
+            if isinstance(target, str):
+                if target not in labels:
+                    raise ValueError(f"Unknown branch target: {target}")
+                return labels[target]
+            if not 0 <= target <= len(instructions):
+                raise ValueError(f"Branch target out of range: {target}")
+            return target
+        
+        resolved = []
+        for index, instruction in enumerate(instructions):
+            if instruction["opcode"] == "JMP":
+                instruction = dict(instruction, target=resolve(instruction["target"], index))
+            elif instruction["opcode"] == "BR3":
+                instruction = dict(
+                    instruction,
+                    neg=resolve(instruction.get("neg"), index),
+                    zero=resolve(instruction.get("zero"), index),
+                    pos=resolve(instruction.get("pos"), index),
+                )
+            resolved.append(instruction)
+        return resolved
+    
+    def execute(self, instructions, workers=None, chunk_size=None, deadline=None):
+        """Execute a sequence of trinary instructions.
+        
+        Passing workers runs element-wise instructions on a thread pool in
+        chunks of chunk_size trits (see trinary_parallel), for very wide
+        registers. If deadline (a time.perf_counter() value) passes before
+        the program finishes, TimeoutError is raised, so programs that loop
+        forever with JMP/BR3 can still be stopped.
+        """
+        if workers is not None:
+            from trinary_parallel import DEFAULT_CHUNK_SIZE, execute_parallel
+            execute_parallel(self, instructions, workers, chunk_size or DEFAULT_CHUNK_SIZE, deadline=deadline)
+            return
+        instructions = self.resolve_branches(instructions)
         while self.program_counter < len(instructions):
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise TimeoutError("Program did not finish before its deadline")
             instruction = instructions[self.program_counter]
             self.program_counter += 1
             
@@ -210,6 +282,24 @@ class TrinaryCPU:
             elif instruction["opcode"] == "SET_MODE":
                 # Set computation mode
                 self.set_computation_mode(instruction["mode"])
+            
+            elif instruction["opcode"] == "JMP":
+                # Unconditional jump to a pre-resolved instruction index
+                self.program_counter = instruction["target"]
+            
+            elif instruction["opcode"] == "BR3":
+                # Three-way branch on the value (-1/0/1) of a single trit
+                trit = self.registers[instruction["src"]][instruction.get("trit", 0)]
+                if trit.value == -1:
+                    self.program_counter = instruction["neg"]
+                elif trit.value == 0:
+                    self.program_counter = instruction["zero"]
+                else:
+                    self.program_counter = instruction["pos"]
+            
+            elif instruction["opcode"] == "LABEL":
+                # Branch targets are resolved before execution starts
+                pass
     
     def get_register(self, reg_num):
         """Get the value of a register."""
@@ -248,13 +338,28 @@ class TrifactoryEngine:
             # AI can benefit from adaptive mode
             self.set_mode("ADAPTIVE")
     
-    def create_quantum_simulation(self, size):
-        """Create a simulated quantum register using trinary values."""
+    def create_quantum_simulation(self, size, backend=None):
+        """Create a simulated quantum register using trinary values.
+        
+        With a backend ("auto", "dense" or "sparse") this returns a real
+        qutrit state vector (see trinary_quantum) with every qutrit holding 0.
+        """
+        if backend is not None:
+            from trinary_quantum import QutritState
+            return QutritState.from_trits([0] * size, backend)
         # In trinary, the 0 state can represent superposition
         return TriWord([0] * size)
     
-    def measure(self, register):
-        """Measure a quantum-simulated register, collapsing 0 states to -1 or 1."""
+    def measure(self, register, shots=None):
+        """Measure a quantum-simulated register, collapsing 0 states to -1 or 1.
+        
+        Qutrit state vectors are collapsed by a real measurement instead, or
+        sampled without collapsing when shots is given.
+        """
+        if not isinstance(register, TriWord):
+            if shots is not None:
+                return register.sample(shots)
+            return TriWord(register.measure().tolist())
         import random
         result = TriWord(length=len(register))
         for i in range(len(register)):
@@ -279,7 +384,7 @@ if __name__ == "__main__":
     ]
     
     # Create and run the CPU
-    cpu = TrinaryCPU()
+    cpu = TrinaryCPU(register_size=4)
     cpu.execute(program)
     
     # Print results
@@ -294,7 +399,7 @@ if __name__ == "__main__":
     print("Decimal value of Register 2:", cpu.get_register(2).to_decimal())
     
     # Example usage with VR simulation
-    cpu = TrinaryCPU(register_count=16, register_size=8)
+    cpu = TrinaryCPU(register_count=16, register_size=4)
     trifactory = TrifactoryEngine(cpu)
     
     # Example VR rendering program
@@ -340,6 +445,24 @@ if __name__ == "__main__":
     print("Total squared magnitude:", cpu.get_register(6))
     print("Trinary AND result:", cpu.get_register(7))
     
+    # Compact trinary loop: for (trit i = -1; i <= 1; i++) { r2 = r2 | i }
+    cpu = TrinaryCPU(register_count=4, register_size=1)
+    program = [
+        {"opcode": "LOAD", "value": [-1], "dest": 0},  # Loop variable i
+        {"opcode": "LOAD", "value": [1], "dest": 1},   # Increment
+        {"opcode": "LOAD", "value": [-1], "dest": 2},  # Accumulator
+        {"opcode": "LABEL", "name": "loop"},
+        {"opcode": "OR", "src1": 2, "src2": 0, "dest": 2},
+        {"opcode": "BR3", "src": 0, "pos": "done"},    # Exit after i == 1
+        {"opcode": "ADD", "src1": 0, "src2": 1, "dest": 0},
+        {"opcode": "JMP", "target": "loop"},
+        {"opcode": "LABEL", "name": "done"},
+        {"opcode": "HALT"}
+    ]
+    cpu.execute(program)
+    print("\nLoop variable after loop:", cpu.get_register(0))
+    print("OR of all loop values:", cpu.get_register(2))
+    
     # Demonstrate quantum simulation
     print("\nQuantum Simulation Example:")
     quantum_reg = trifactory.create_quantum_simulation(4)
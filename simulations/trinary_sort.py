@@ -0,0 +1,161 @@
+"""
+Trinary Sorting
+
+This module implements the trinary quicksort described in
+examples/algorithms/trinary_sort.md for packed TriWord arrays. Partitioning is
+three-way (less / equal / greater than the pivot) and runs on integer keys
+extracted in one vectorized pass, with an external-memory merge mode for
+datasets larger than RAM.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from trinary_arrays import MAX_DECIMAL_TRITS, pack_triwords, to_decimal, unpack_triwords
+
+# Partitions at or below this size are finished with a single stable argsort
+SMALL_PARTITION = 4096
+
+
+def trinary_quicksort_keys(keys):
+    """Return the indices that stably sort keys, using three-way partitioning."""
+    work = np.array(keys, copy=True).reshape(-1)
+    order = np.arange(work.size)
+    stack = [(0, work.size)]
+    while stack:
+        lo, hi = stack.pop()
+        segment = work[lo:hi]
+        indices = order[lo:hi]
+        if hi - lo <= SMALL_PARTITION:
+            local = np.argsort(segment, kind="stable")
+            work[lo:hi] = segment[local]
+            order[lo:hi] = indices[local]
+            continue
+
+        # Median-of-three pivot, then split into the three trinary regions
+        mid = (hi - lo) // 2
+        pivot = np.sort(segment[[0, mid, -1]])[1]
+        less = segment < pivot
+        greater = segment > pivot
+        equal = ~(less | greater)
+        n_less = int(np.count_nonzero(less))
+        n_equal = int(np.count_nonzero(equal))
+
+        work[lo:hi] = np.concatenate((segment[less], segment[equal], segment[greater]))
+        order[lo:hi] = np.concatenate((indices[less], indices[equal], indices[greater]))
+
+        stack.append((lo, lo + n_less))
+        stack.append((lo + n_less + n_equal, hi))
+    return order
+
+
+def argsort_triwords(array):
+    """Return the indices that sort packed TriWords by balanced-ternary value."""
+    array = np.atleast_2d(array)
+    if array.shape[1] <= MAX_DECIMAL_TRITS:
+        return trinary_quicksort_keys(to_decimal(array))
+    # Too wide for int64 keys: most-significant-first trit order is numeric order
+    return np.lexsort(array.T[::-1])
+
+
+def sort_triwords(array):
+    """Return a sorted copy of a (count, width) packed TriWord array."""
+    array = np.atleast_2d(array)
+    return array[argsort_triwords(array)]
+
+
+def sort_triword_list(words):
+    """Sort a list of TriWord objects by value and return new TriWords."""
+    words = list(words)
+    if not words:
+        return []
+    return unpack_triwords(sort_triwords(pack_triwords(words)))
+
+
+def external_sort(source, destination, width, chunk_rows=1 << 20, merge_rows=1 << 16, tmp_dir=None):
+    """Sort a raw int8 trit file of shape (count, width) into destination.
+
+    The source is sorted in runs of chunk_rows that fit in memory, then the
+    runs are merged in blocks of merge_rows, so peak memory stays bounded by
+    the chunk size rather than the dataset size.
+    """
+    if width > MAX_DECIMAL_TRITS:
+        raise ValueError(f"External sort supports words up to {MAX_DECIMAL_TRITS} trits")
+    size = os.path.getsize(source)
+    if size % width:
+        raise ValueError("Source size is not a multiple of the word width")
+    count = size // width
+    if count == 0:
+        open(destination, "wb").close()
+        return 0
+
+    source_array = np.memmap(source, dtype=np.int8, mode="r", shape=(count, width))
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        runs = []
+        for start in range(0, count, chunk_rows):
+            chunk = np.array(source_array[start:start + chunk_rows])
+            path = os.path.join(tmp, f"run{len(runs)}.npy")
+            np.save(path, chunk[argsort_triwords(chunk)])
+            runs.append(path)
+
+        output = np.memmap(destination, dtype=np.int8, mode="w+", shape=(count, width))
+        _merge_runs([np.load(path, mmap_mode="r") for path in runs], output, merge_rows)
+        output.flush()
+        del output
+    return count
+
+
+def _merge_runs(runs, output, merge_rows):
+    """Merge sorted runs into output, emitting everything below a safe key bound per round."""
+    positions = [0] * len(runs)
+    buffers = [None] * len(runs)
+    written = 0
+    while True:
+        for i, run in enumerate(runs):
+            if (buffers[i] is None or len(buffers[i][0]) == 0) and positions[i] < len(run):
+                block = np.array(run[positions[i]:positions[i] + merge_rows])
+                positions[i] += len(block)
+                buffers[i] = (block, to_decimal(block))
+        active = [i for i, buffer in enumerate(buffers) if buffer is not None and len(buffer[0])]
+        if not active:
+            return written
+
+        # Rows up to the smallest buffered maximum of any run with more data are final
+        pending = [buffers[i][1][-1] for i in active if positions[i] < len(runs[i])]
+        bound = min(pending) if pending else None
+
+        trits, keys = [], []
+        for i in active:
+            block, block_keys = buffers[i]
+            take = len(block) if bound is None else int(np.searchsorted(block_keys, bound, side="right"))
+            trits.append(block[:take])
+            keys.append(block_keys[:take])
+            buffers[i] = (block[take:], block_keys[take:])
+
+        merged = np.concatenate(trits)
+        order = np.argsort(np.concatenate(keys), kind="stable")
+        output[written:written + len(merged)] = merged[order]
+        written += len(merged)
+
+
+# Example usage of the sorting module
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    words = rng.integers(-1, 2, size=(1_000_000, 12), dtype=np.int8)
+
+    started = time.perf_counter()
+    ordered = sort_triwords(words)
+    print(f"Sorted {len(words)} TriWords in {time.perf_counter() - started:.3f}s")
+    print("Smallest:", unpack_triwords(ordered[:1])[0], "Largest:", unpack_triwords(ordered[-1:])[0])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "words.trits")
+        destination = os.path.join(tmp, "sorted.trits")
+        words.tofile(source)
+        external_sort(source, destination, width=12, chunk_rows=200_000, merge_rows=20_000)
+        on_disk = np.fromfile(destination, dtype=np.int8).reshape(-1, 12)
+        print("External sort matches in-memory sort:", bool(np.array_equal(on_disk, ordered)))